@@ -22,8 +22,11 @@ import sys
 import os
 import json
 import hashlib
+import re
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from PyQt5.QtWidgets import (
@@ -36,6 +39,69 @@ from PyQt5.QtGui import QFont, QIcon, QPixmap, QPalette, QColor
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
 import logging
 
+# Optional faster JSON for exported results
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from matching_common import (
+    BATCH_TOKENS_PER_FAMILY, FamilyFeatureIndex, ResponseCache, batch_match_prompt,
+    parse_batch_reply, prompt_json
+)
+
+# Maximum number of Ollama requests in flight during a matching run.
+# Ollama only serves them concurrently when started with e.g.
+# OLLAMA_NUM_PARALLEL=8 and OLLAMA_MAX_LOADED_MODELS=1; otherwise it
+# queues them and matching falls back to sequential speed.
+MAX_PARALLEL_REQUESTS = 8
+
+# (connect, read) timeouts for Ollama requests; a dead server fails fast
+# while slow generations still get the full read window.
+OLLAMA_TIMEOUT = (10, 60)
+
+# The whole batch matching reply arrives at once, so its read timeout grows
+# by BATCH_SECONDS_PER_FAMILY for every family in the batch
+BATCH_SECONDS_PER_FAMILY = 40
+
+# Fallback score extraction for replies that are not structured JSON. One
+# alternation covers "Score: 87", "Match Score: 87%", "Overall: 87",
+# "<score>87</score>" and the "score": key of a JSON reply still streaming,
+# plus markdown and prose around the label: "**Score:** 87", "Score - 87",
+# "The score is 87" and "Matching score (0-100): 87".
+_SCORE_RE = re.compile(
+    r'(?:<score>|score"?|overall"?)(?:\s*\(0\s*-\s*100\))?[\s:=*\-]*(?:(?:is|of)\s+)?(\d{1,3})(?!\d)',
+    re.IGNORECASE)
+_REASONING_RE = re.compile(r'"reasoning"\s*:\s*"((?:[^"\\]|\\.)*)')
+
+# Streamed chunks (roughly tokens) still read for reasoning once the score
+# has been emitted; the rest of the generation is cancelled
+REASONING_TOKEN_BUDGET = 200
+
+# In-memory cache of match results for this session. Replies reason about a
+# specific child, so they are never written to disk. Entries expire after a
+# day and the least recently used go first.
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = 86400
+
+# Once the database grows past this size only the best pre-ranked families
+# are sent to the model; the rest are clearly weaker on the basic criteria
+MAX_LLM_CANDIDATES = 10
+
+# Models tried in turn when the selected one fails, largest first
+MODEL_FALLBACK_ORDER = ('qwen3_480b', 'gpt_oss_120b', 'qwen2_72b')
+
+# Small local model that prescreens shortlisted families with a bare score;
+# only the best PRESCORE_KEEP go on to the large model for full reasoning
+PRESCORE_MODEL = 'qwen2.5:7b'
+PRESCORE_TOKENS = 64
+PRESCORE_KEEP = 5
+
+def _profile_signature(family):
+    """Matching-relevant part of a family profile, for spotting duplicates"""
+    return prompt_json({key: value for key, value in family.items()
+                        if key not in ('id', 'name', 'address', 'phone', 'email', 'ssn')})
+
 class PIIProtection:
     """Strict PII protection for Massachusetts compliance"""
     
@@ -46,8 +112,9 @@ class PIIProtection:
             anonymized = {}
             for key, value in data.items():
                 if key in ['name', 'address', 'phone', 'email', 'ssn']:
-                    # Hash sensitive data for matching without exposing PII
-                    anonymized[key] = hashlib.sha256(str(value).encode()).hexdigest()[:8]
+                    # Hash sensitive data for matching without exposing PII;
+                    # hex of the first 4 digest bytes == hexdigest()[:8]
+                    anonymized[key] = hashlib.sha256(str(value).encode()).digest()[:4].hex()
                 else:
                     anonymized[key] = value
             return anonymized
@@ -65,12 +132,32 @@ class OllamaMatchingEngine:
     def __init__(self):
         # Use local Ollama with cloud models (like ActivatePrime)
         self.local_endpoint = "http://127.0.0.1:11434/api/generate"
+        
+        # Keep-alive connection pool so repeated calls skip the TCP handshake.
+        # One socket per concurrent worker so parallel matching never has to
+        # open and discard overflow connections.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_PARALLEL_REQUESTS,
+                              pool_block=True, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Connection': 'keep-alive',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        
         self.cloud_models = {
             'qwen3_480b': 'qwen3-coder:480b-cloud',
             'gpt_oss_120b': 'gpt-oss:120b-cloud',
             'qwen2_72b': 'qwen2.5:72b'
         }
         self.current_model = 'qwen3_480b'  # Start with 480B model
+        
+        # family id -> (profile snapshot, anonymized profile)
+        self._anon_cache = {}
+        self._feature_index = None
+        # (model, num_predict, json_mode, stream, temperature) -> serialized request body minus the prompt
+        self._payload_envelopes = {}
+        self.response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
         self.matching_prompts = {
             'child_family': """
             You are a compassionate AI helping match children with loving families.
@@ -86,9 +173,16 @@ class OllamaMatchingEngine:
             - Geographic considerations
             - Family dynamics and preferences
             
-            Provide a matching score (0-100) and detailed reasoning.
+            Provide a matching score (0-100) and detailed reasoning as JSON:
+            {{"score": <0-100>, "reasoning": "<detailed reasoning>"}}
             Be empathetic and focus on the child's best interests.
             """,
+            'prescore': """
+            Rate how well this family fits this child for adoption or foster care.
+            Child: {child_profile}
+            Family: {family_profile}
+            Answer with only "Score: NN" where NN is 0-100.
+            """,
             'compatibility_analysis': """
             Analyze compatibility between child and family:
             Child: {child_data}
@@ -101,98 +195,392 @@ class OllamaMatchingEngine:
             - recommendations (specific suggestions)
             """
         }
+        
+        # Split the per-family template around the family slot once, so each
+        # family only costs a concatenation instead of a full str.format
+        head, tail = self.matching_prompts['child_family'].split('{family_profile}')
+        self._family_prompt_head = head
+        self._family_prompt_tail = tail.format()
     
     def get_matching_recommendations(self, child_profile, family_profiles):
         """Get AI-powered matching recommendations"""
         try:
-            recommendations = []
+            if not family_profiles:
+                return []
             
-            for family in family_profiles:
-                # Prepare anonymized data for AI analysis
-                child_anon = PIIProtection.anonymize_data(child_profile)
-                family_anon = PIIProtection.anonymize_data(family)
-                
-                # Create matching prompt
-                prompt = self.matching_prompts['child_family'].format(
-                    child_profile=json.dumps(child_anon, indent=2),
-                    family_profile=json.dumps(family_anon, indent=2)
-                )
-                
-                # Call Ollama API
-                response = self._call_ollama_api(prompt)
-                
-                if response:
+            # Prepare anonymized data for AI analysis
+            child_json = prompt_json(PIIProtection.anonymize_data(child_profile))
+            candidates = self._shortlist(child_profile, family_profiles)
+            families_anon = [self._anonymize_family(family) for family in candidates]
+            
+            # Reuse results the selected model gave for (child, family) before
+            model = self.cloud_models[self.current_model]
+            family_jsons = {}
+            recommendations = []
+            prescreened = []
+            uncached = []
+            for family in families_anon:
+                family_json = prompt_json(family)
+                cached = self.response_cache.get(ResponseCache.make_key(child_json, family_json, model))
+                if cached:
                     recommendations.append({
                         'family_id': family.get('id', 'unknown'),
-                        'match_score': self._extract_score(response),
-                        'reasoning': response,
+                        'match_score': cached[0],
+                        'reasoning': cached[1],
                         'timestamp': datetime.now().isoformat()
                     })
+                else:
+                    family_jsons[family.get('id', 'unknown')] = family_json
+                    uncached.append(family)
             
-            # Sort by match score
+            if uncached:
+                # Families whose matching criteria are identical get the same
+                # answer, so only one of each group is sent to the model
+                groups = {}
+                for family in uncached:
+                    groups.setdefault(_profile_signature(family), []).append(family)
+                representatives = [members[0] for members in groups.values()]
+                if len(representatives) < len(uncached):
+                    logging.info(f"Skipped {len(uncached) - len(representatives)} duplicate family profiles")
+                
+                detailed, prescreened = self._prescreen(child_json, representatives)
+                
+                # Score every family in a single call, then fall back to
+                # per-family prompts for anything the batch reply missed
+                fresh, batch_model = self._match_batch(child_json, detailed)
+                # Results are cached under the model that actually answered,
+                # which may be a fallback rather than the selected one
+                answered_by = dict.fromkeys((rec['family_id'] for rec in fresh), batch_model)
+                remaining = [family for family in detailed
+                             if family.get('id', 'unknown') not in answered_by]
+                if remaining:
+                    more, models = self._match_each(child_json, remaining)
+                    fresh.extend(more)
+                    answered_by.update(models)
+                
+                duplicates = {members[0].get('id', 'unknown'): members[1:]
+                              for members in groups.values() if len(members) > 1}
+                if duplicates:
+                    fresh = self._copy_to_duplicates(fresh, duplicates)
+                    prescreened = self._copy_to_duplicates(prescreened, duplicates)
+                    for family_id, members in duplicates.items():
+                        if family_id in answered_by:
+                            for family in members:
+                                answered_by[family.get('id', 'unknown')] = answered_by[family_id]
+                
+                for rec in fresh:
+                    key = ResponseCache.make_key(child_json, family_jsons[rec['family_id']],
+                                                 answered_by[rec['family_id']])
+                    self.response_cache.set(key, (rec['match_score'], rec['reasoning']))
+                recommendations.extend(fresh)
+            
+            # Sort by match score. Prescreen scores come from a much smaller
+            # model, so those families follow every fully analysed one
             recommendations.sort(key=lambda x: x['match_score'], reverse=True)
-            return recommendations
+            return recommendations + prescreened
             
         except Exception as e:
             logging.error(f"Matching engine error: {e}")
             return []
     
-    def _call_ollama_api(self, prompt):
-        """Call local Ollama with cloud models for AI analysis"""
-        try:
-            headers = {
-                'Content-Type': 'application/json'
-            }
+    def _shortlist(self, child_profile, family_profiles):
+        """Limit the families sent to the LLM to the best pre-ranked candidates"""
+        if len(family_profiles) <= MAX_LLM_CANDIDATES:
+            return family_profiles
+        if self._feature_index is None or self._feature_index.families != family_profiles:
+            self._feature_index = FamilyFeatureIndex(family_profiles)
+        candidates = self._feature_index.top(child_profile, MAX_LLM_CANDIDATES)
+        logging.info(f"Pre-ranking skipped {len(family_profiles) - len(candidates)} families")
+        return candidates
+    
+    def _anonymize_family(self, family):
+        """Anonymize a family profile, reusing the result while it is unchanged"""
+        family_id = family.get('id')
+        cached = self._anon_cache.get(family_id)
+        if cached and cached[0] == family:
+            return cached[1]
+        
+        family_anon = PIIProtection.anonymize_data(family)
+        if family_id is not None:
+            self._anon_cache[family_id] = (dict(family), family_anon)
+        return family_anon
+    
+    def _copy_to_duplicates(self, recommendations, duplicates):
+        """Repeat each representative's result for its duplicate families"""
+        expanded = []
+        for rec in recommendations:
+            expanded.append(rec)
+            for family in duplicates.get(rec['family_id'], ()):
+                expanded.append(dict(rec, family_id=family.get('id', 'unknown')))
+        return expanded
+    
+    def _prescreen(self, child_json, families_anon):
+        """Split families into those worth a full analysis and prescored rest
+        
+        Returns (families for the large model, recommendations for the others).
+        The latter are marked 'prescreened' as lower-confidence scores and are
+        already ordered best first.
+        """
+        if len(families_anon) <= PRESCORE_KEEP:
+            return families_anon, []
+        
+        prompts = []
+        prescores = {}
+        keys = {}
+        for family in families_anon:
+            family_id = family.get('id', 'unknown')
+            family_json = prompt_json(family)
+            key = ResponseCache.make_key(child_json, family_json, PRESCORE_MODEL)
+            cached = self.response_cache.get(key)
+            if cached:
+                prescores[family_id] = cached[0]
+            else:
+                keys[family_id] = key
+                prompts.append((family, self.matching_prompts['prescore'].format(
+                    child_profile=child_json, family_profile=family_json)))
+        
+        if prompts:
+            workers = min(MAX_PARALLEL_REQUESTS, len(prompts))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                responses = list(executor.map(
+                    lambda item: self._call_ollama_api(item[1], num_predict=PRESCORE_TOKENS,
+                                                       model=PRESCORE_MODEL, temperature=0.2),
+                    prompts))
+            for (family, _), response in zip(prompts, responses):
+                if response and _SCORE_RE.search(response):
+                    score = self._extract_score(response)
+                    prescores[family.get('id', 'unknown')] = score
+                    self.response_cache.set(keys[family.get('id', 'unknown')], (score, ''))
+        
+        if not prescores:
+            # Prescreen model unavailable - send everything for full analysis
+            return families_anon, []
+        
+        ranked = sorted(families_anon, key=lambda family: prescores.get(family.get('id', 'unknown'), -1), reverse=True)
+        timestamp = datetime.now().isoformat()
+        prescreened = [{
+            'family_id': family.get('id', 'unknown'),
+            'match_score': prescores.get(family.get('id', 'unknown'), 0),
+            'reasoning': f"Prescreened by {PRESCORE_MODEL}; not shortlisted for detailed analysis.",
+            'timestamp': timestamp,
+            'prescreened': True
+        } for family in ranked[PRESCORE_KEEP:]]
+        return ranked[:PRESCORE_KEEP], prescreened
+    
+    def _match_batch(self, child_json, families_anon):
+        """Score all families with one Ollama call, skipping unusable entries
+        
+        Returns (recommendations, name of the model that answered).
+        """
+        connect_timeout, read_timeout = OLLAMA_TIMEOUT
+        response, model_name = self._generate(
+            batch_match_prompt(child_json, families_anon),
+            num_predict=BATCH_TOKENS_PER_FAMILY * len(families_anon),
+            timeout=(connect_timeout, read_timeout + BATCH_SECONDS_PER_FAMILY * len(families_anon)))
+        if not response:
+            return [], None
+        recommendations = parse_batch_reply(response, families_anon)
+        return recommendations, model_name if recommendations else None
+    
+    def _match_each(self, child_json, families_anon):
+        """Score families with one Ollama call each, issued concurrently
+        
+        Returns (recommendations, family id -> name of the model that answered).
+        """
+        prefix = self._family_prompt_head.format(child_profile=child_json)
+        suffix = self._family_prompt_tail
+        prompts = [prefix + prompt_json(family_anon) + suffix for family_anon in families_anon]
+        
+        workers = min(MAX_PARALLEL_REQUESTS, len(prompts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            responses = list(executor.map(
+                lambda prompt: self._generate(prompt, json_mode=True, stop_after_score=True), prompts))
+        
+        recommendations = []
+        models = {}
+        for family, (response, model_name) in zip(families_anon, responses):
+            if response:
+                score, reasoning = self._parse_match_reply(response)
+                recommendations.append({
+                    'family_id': family.get('id', 'unknown'),
+                    'match_score': score,
+                    'reasoning': reasoning,
+                    'timestamp': datetime.now().isoformat()
+                })
+                models[family.get('id', 'unknown')] = model_name
+        return recommendations, models
+    
+    def _call_ollama_api(self, prompt, num_predict=2000, json_mode=False, stop_after_score=False,
+                         model=None, temperature=0.7, timeout=OLLAMA_TIMEOUT):
+        """Call local Ollama with cloud models for AI analysis
+        
+        With stop_after_score the reply is streamed and generation is cut
+        short once the score and a little reasoning have been produced.
+        An explicit model is used as-is, without the fallback chain.
+        """
+        return self._generate(prompt, num_predict, json_mode, stop_after_score, model, temperature, timeout)[0]
+    
+    def _generate(self, prompt, num_predict=2000, json_mode=False, stop_after_score=False,
+                  model=None, temperature=0.7, timeout=OLLAMA_TIMEOUT):
+        """Like _call_ollama_api, returning (reply, name of the model that answered)"""
+        headers = {
+            'Content-Type': 'application/json'
+        }
+        # Only the prompt changes between calls; serialize it once and splice
+        # it into the cached envelope for each model tried
+        prompt_bytes = json.dumps(prompt).encode('utf-8')
+        
+        # Fall back to smaller models for this call only, and only when a model
+        # is not installed; current_model is left alone so the preferred model
+        # is retried on the next request
+        if model:
+            models = [model]
+        else:
+            models = [self.cloud_models[model_key] for model_key in self._fallback_chain()]
+        for model_name in models:
+            head, tail = self._payload_envelope(model_name, num_predict, json_mode, stop_after_score, temperature)
+            body = head + prompt_bytes + tail
+            try:
+                response = self.session.post(self.local_endpoint, data=body, headers=headers,
+                                             timeout=timeout, stream=stop_after_score)
+            except Exception as e:
+                # Unreachable or too slow: a smaller model would only repeat the
+                # wait, so let the caller fall back to its own cheaper path
+                logging.error(f"Local Ollama API error ({model_name}): {e}")
+                return None, None
             
+            # Streamed responses hold their pooled connection until closed, and
+            # the pool blocks when full, so every path out releases it
+            with response:
+                if response.status_code == 200:
+                    if stop_after_score:
+                        return self._read_until_scored(response), model_name
+                    result = response.json()
+                    return result.get('response', ''), model_name
+                if response.status_code == 404:
+                    # Model not pulled locally - move straight on to the next one
+                    logging.error(f"Local Ollama model not found: {model_name}")
+                    continue
+                logging.error(f"Local Ollama error: {response.status_code} - {response.text}")
+                return None, None
+        
+        return None, None
+    
+    def _read_until_scored(self, response):
+        """Collect a streamed reply, closing it early once the score is in"""
+        text = ''
+        budget = None
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                text += chunk.get('response', '')
+                if chunk.get('done'):
+                    break
+                if budget is None:
+                    if _SCORE_RE.search(text):
+                        budget = REASONING_TOKEN_BUDGET
+                else:
+                    budget -= 1
+                    if budget <= 0:
+                        break
+        except Exception as e:
+            logging.error(f"Local Ollama stream error: {e}")
+        finally:
+            # Dropping the connection mid-stream makes Ollama stop generating
+            response.close()
+        return text
+    
+    def _payload_envelope(self, model_name, num_predict, json_mode, stream=False, temperature=0.7):
+        """Serialized request body around the prompt field, built once per shape"""
+        shape = (model_name, num_predict, json_mode, stream, temperature)
+        envelope = self._payload_envelopes.get(shape)
+        if envelope is None:
             payload = {
-                "model": self.cloud_models[self.current_model],
-                "prompt": prompt,
-                "stream": False,
+                "model": model_name,
+                "stream": stream,
                 "options": {
-                    "temperature": 0.7,
-                    "num_predict": 2000
+                    "temperature": temperature,
+                    "num_predict": num_predict
                 }
             }
-            
-            response = requests.post(self.local_endpoint, json=payload, headers=headers, timeout=60)
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('response', '')
-            else:
-                logging.error(f"Local Ollama error: {response.status_code} - {response.text}")
-                return None
-            
-        except Exception as e:
-            logging.error(f"Local Ollama API error: {e}")
-            # Try fallback to 120B model if 480B fails
-            if self.current_model == 'qwen3_480b':
-                self.current_model = 'gpt_oss_120b'
-                return self._call_ollama_api(prompt)
-            elif self.current_model == 'gpt_oss_120b':
-                self.current_model = 'qwen2_72b'
-                return self._call_ollama_api(prompt)
-            return None
+            if json_mode:
+                # Constrain generation to valid JSON for structured parsing
+                payload["format"] = "json"
+            head = json.dumps(payload, separators=(',', ':'))[:-1] + ',"prompt":'
+            envelope = (head.encode('utf-8'), b'}')
+            self._payload_envelopes[shape] = envelope
+        return envelope
+    
+    def _fallback_chain(self):
+        """Models to try in order, starting from the selected one"""
+        chain = [self.current_model]
+        if self.current_model in MODEL_FALLBACK_ORDER:
+            index = MODEL_FALLBACK_ORDER.index(self.current_model)
+            chain.extend(MODEL_FALLBACK_ORDER[index + 1:])
+        return chain
+    
+    def close(self):
+        """Release pooled connections to Ollama"""
+        self.session.close()
+    
+    def _parse_match_reply(self, response):
+        """Split a per-family reply into (score, reasoning)"""
+        try:
+            reply = json.loads(response)
+            return int(reply['score']), str(reply.get('reasoning', response))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            # Model ignored the JSON format, or the stream was cut short after
+            # the score; scrape what is there from the text
+            reasoning = _REASONING_RE.search(response)
+            if reasoning:
+                return self._extract_score(response), reasoning.group(1).replace('\\"', '"').strip()
+            return self._extract_score(response), response
     
     def _extract_score(self, response):
         """Extract matching score from AI response"""
         try:
-            # Look for score in response
-            import re
-            score_match = re.search(r'score[:\s]*(\d+)', response.lower())
-            if score_match:
-                return int(score_match.group(1))
+            # First score-like number that is actually on the 0-100 scale
+            for score_match in _SCORE_RE.finditer(response):
+                score = int(score_match.group(1))
+                if score <= 100:
+                    return score
             return 50  # Default neutral score
-        except:
+        except (TypeError, ValueError):
             return 50
 
+class MatchingWorker(QThread):
+    """Run the matching engine off the GUI thread"""
+    
+    results_ready = pyqtSignal(list)
+    error = pyqtSignal(str)
+    
+    def __init__(self, engine, child_profile, family_profiles, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.child_profile = child_profile
+        self.family_profiles = list(family_profiles)
+    
+    def run(self):
+        try:
+            recommendations = self.engine.get_matching_recommendations(
+                self.child_profile, self.family_profiles
+            )
+            self.results_ready.emit(recommendations)
+        except Exception as e:
+            self.error.emit(str(e))
+
 class HeartMatchGUI(QMainWindow):
     """Main HeartMatch Child-Family Matching Interface"""
     
     def __init__(self):
         super().__init__()
         self.matching_engine = OllamaMatchingEngine()
+        self.matching_worker = None
         self.current_child = None
         self.family_database = []
+        self.family_by_id = {}
         self.matching_results = []
         
         self.init_ui()
@@ -522,6 +910,8 @@ class HeartMatchGUI(QMainWindow):
     
     def refresh_family_list(self):
         """Refresh the family list display"""
+        # Every change to family_database ends up here, so keep the id lookup in step
+        self.family_by_id = {family['id']: family for family in self.family_database}
         self.family_list.clear()
         for family in self.family_database:
             item_text = f"{family['family_type']} - {family['age_range']} - {family['location']}"
@@ -546,22 +936,34 @@ class HeartMatchGUI(QMainWindow):
                 QMessageBox.warning(self, "PII Compliance", "Please ensure all required fields are completed.")
                 return
             
+            if self.matching_worker is not None and self.matching_worker.isRunning():
+                return
+            
             # Show progress
             self.statusBar().showMessage("🤖 AI is analyzing compatibility... Please wait.")
+            self.find_matches_button.setEnabled(False)
             
-            # Get AI recommendations
-            recommendations = self.matching_engine.get_matching_recommendations(
-                child_profile, self.family_database
+            # Get AI recommendations in the background
+            self.matching_worker = MatchingWorker(
+                self.matching_engine, child_profile, self.family_database, self
             )
-            
-            # Display results
-            self.display_matching_results(recommendations)
-            
-            self.statusBar().showMessage(f"✅ Found {len(recommendations)} potential matches!")
+            self.matching_worker.results_ready.connect(self.on_matches_ready)
+            self.matching_worker.error.connect(self.on_matching_error)
+            self.matching_worker.finished.connect(lambda: self.find_matches_button.setEnabled(True))
+            self.matching_worker.start()
             
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to find matches: {str(e)}")
-            self.statusBar().showMessage("❌ Error occurred during matching.")
+            self.on_matching_error(str(e))
+    
+    def on_matches_ready(self, recommendations):
+        """Display recommendations delivered by the matching worker"""
+        self.display_matching_results(recommendations)
+        self.statusBar().showMessage(f"✅ Found {len(recommendations)} potential matches!")
+    
+    def on_matching_error(self, message):
+        """Report a matching failure"""
+        QMessageBox.critical(self, "Error", f"Failed to find matches: {message}")
+        self.statusBar().showMessage("❌ Error occurred during matching.")
     
     def display_matching_results(self, recommendations):
         """Display matching results in the UI"""
@@ -573,9 +975,11 @@ class HeartMatchGUI(QMainWindow):
             score = match['match_score']
             
             # Find family details
-            family = next((f for f in self.family_database if f['id'] == family_id), None)
+            family = self.family_by_id.get(family_id)
             if family:
                 item_text = f"💖 Match #{i+1}: {family['family_type']} - Score: {score}%"
+                if match.get('prescreened'):
+                    item_text += " (prescreen only)"
                 item = QListWidgetItem(item_text)
                 item.setData(Qt.UserRole, match)
                 self.matching_results_list.addItem(item)
@@ -591,7 +995,7 @@ class HeartMatchGUI(QMainWindow):
         family_id = match_data['family_id']
         
         # Find family details
-        family = next((f for f in self.family_database if f['id'] == family_id), None)
+        family = self.family_by_id.get(family_id)
         if not family:
             return
         
@@ -707,8 +1111,14 @@ Values: {family['values']}
         # Save to file
         filename = f"HeartMatch_Results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         try:
-            with open(filename, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            # Build the whole document first and write it in one call;
+            # orjson indents natively when available
+            if orjson is not None:
+                content = orjson.dumps(export_data, option=orjson.OPT_INDENT_2)
+            else:
+                content = json.dumps(export_data, indent=2).encode('utf-8')
+            with open(filename, 'wb') as f:
+                f.write(content)
             QMessageBox.information(self, "Export Complete", f"Results exported to {filename}")
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to export: {str(e)}")
@@ -719,6 +1129,14 @@ Values: {family['values']}
             self.statusBar().showMessage("🔄 Refreshing matches...")
             # Re-run matching if needed
             self.statusBar().showMessage("✅ Matches refreshed")
+    
+    def closeEvent(self, event):
+        """Release engine resources on shutdown"""
+        self.refresh_timer.stop()
+        if self.matching_worker is not None:
+            self.matching_worker.wait()
+        self.matching_engine.close()
+        super().closeEvent(event)
 
 def main():
     """Main application entry point"""
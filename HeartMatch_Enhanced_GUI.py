@@ -14,26 +14,49 @@ Version: 2.0.0
 import sys
 import os
 import json
+import functools
 import hashlib
+import html
+import heapq
+import math
+import re
 import subprocess
+import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTextEdit, QLineEdit, QPushButton, QVBoxLayout,
     QHBoxLayout, QWidget, QComboBox, QLabel, QTabWidget, QGroupBox, QGridLayout,
-    QProgressBar, QMessageBox, QSplitter, QFrame, QListWidget, QListWidgetItem,
-    QCheckBox, QSpinBox, QSlider, QTextBrowser, QScrollArea, QFormLayout,
-    QDialog, QDialogButtonBox, QTableWidget, QTableWidgetItem, QFileDialog,
+    QProgressBar, QMessageBox, QSplitter, QFrame, QListWidget, QListWidgetItem, QListView,
+    QCheckBox, QSpinBox, QSlider, QTextBrowser, QPlainTextEdit, QScrollArea, QFormLayout,
+    QDialog, QDialogButtonBox, QTableView, QHeaderView, QFileDialog,
     QInputDialog
 )
-from PyQt5.QtGui import QFont, QIcon, QPixmap, QPalette, QColor, QTextCursor
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
+from PyQt5.QtGui import (
+    QFont, QIcon, QPixmap, QPalette, QColor, QTextCursor, QTextCharFormat,
+    QPainter, QPainterPath, QLinearGradient
+)
+from PyQt5.QtCore import (
+    Qt, QTimer, QThread, QObject, QFileInfo, QRunnable, QThreadPool, pyqtSignal, QPropertyAnimation, QEasingCurve,
+    QAbstractTableModel, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+)
 import logging
-import PyPDF2
-import fitz  # PyMuPDF
-from PIL import Image
-import base64
+
+# Optional faster JSON for Ollama request/response bodies
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from matching_common import (
+    BATCH_TOKENS_PER_FAMILY, FamilyFeatureIndex, ResponseCache, batch_match_prompt,
+    parse_batch_reply, prompt_json
+)
 
 # Import API key manager
 sys.path.append(os.path.join(os.path.dirname(__file__), 'secure_features'))
@@ -89,6 +112,460 @@ except ImportError as e:
     def validate_data_compliance(data, standards):
         return True, []
 
+# One manager of each kind per process, whichever implementation was loaded
+get_accessibility_manager = functools.lru_cache(maxsize=1)(get_accessibility_manager)
+get_pii_protection = functools.lru_cache(maxsize=1)(get_pii_protection)
+get_hipaa_compliance = functools.lru_cache(maxsize=1)(get_hipaa_compliance)
+
+# Size of the pooled connection set to the local Ollama server, which also
+# caps how many matching requests are in flight at once. Ollama only runs
+# them concurrently when started with OLLAMA_NUM_PARALLEL > 1.
+OLLAMA_POOL_SIZE = 10
+
+# Score extraction from free-text model replies
+_SCORE_RE = re.compile(r'score[:\s]*(\d+)', re.IGNORECASE)
+
+# Embedding model used to shortlist families before the expensive per-family
+# generate calls; only the EMBED_TOP_K closest families are sent on
+EMBED_MODEL = 'nomic-embed-text'
+EMBED_TOP_K = 5
+
+def _parse_age_range(value):
+    """Parse an 'min-max' age range into a pair of ints, or None"""
+    try:
+        low, high = str(value).split('-', 1)
+        return int(low), int(high)
+    except (TypeError, ValueError):
+        return None
+
+def top_matches(recommendations, count):
+    """The count highest-scoring recommendations, best first"""
+    return heapq.nlargest(count, recommendations, key=itemgetter('match_score'))
+
+def _cosine_similarity(a, b):
+    """Cosine similarity of two equal-length vectors"""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+@functools.lru_cache(maxsize=1)
+def _numpy():
+    """NumPy for vectorized similarity scoring, or None if not installed
+    
+    Imported on first use so the window opens without paying for it.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _top_k_by_similarity(query, vectors, k):
+    """Indexes of the k vectors most cosine-similar to query, best first"""
+    np = _numpy()
+    if np is not None:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        scores = np.divide(matrix @ query, norms, out=np.zeros(len(matrix), dtype=np.float32), where=norms != 0)
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        return [int(i) for i in top[np.argsort(-scores[top])]]
+    return heapq.nlargest(k, range(len(vectors)), key=lambda i: _cosine_similarity(query, vectors[i]))
+
+# In-memory reuse of identical Ollama requests (matching refreshes, repeated
+# chat questions); least recently used entries go first
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL = 3600
+
+def _json_body(data):
+    """Encode a request body to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+def _json_loads(data):
+    """Decode a JSON response body or stream line"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _default_file_mode():
+    """Permissions open() gives a new file under the current umask"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def _write_json_file(filename, data):
+    """Write data as indented JSON, replacing the file only once fully written"""
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(data, indent=2).encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        try:
+            f = os.fdopen(fd, 'wb')
+        except BaseException:
+            os.close(fd)
+            raise
+        with f:
+            f.write(content)
+        # mkstemp creates the file owner-only; give it the usual permissions
+        os.chmod(temp_path, _default_file_mode())
+        os.replace(temp_path, filename)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+# Finished recommendation lists kept per (child profile, family data, model)
+MATCH_CACHE_SIZE = 32
+
+# Chat turns kept per chatbot session
+CONVERSATION_HISTORY_LIMIT = 50
+
+def create_ollama_session():
+    """Create a keep-alive session for talking to the local Ollama server"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=OLLAMA_POOL_SIZE, max_retries=0)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Connection': 'keep-alive',
+        'Accept-Encoding': 'gzip, deflate',
+        'Content-Type': 'application/json'
+    })
+    return session
+
+# Application stylesheet for the main window. It is parsed once when set
+# in init_ui and applies to widgets by objectName; widgets never carry their
+# own stylesheet.
+_HEADER_BUTTON_QSS = """
+    {selector} {{
+        background: linear-gradient(135deg, {start}, {end});
+        color: white;
+        font-size: 14px;
+        font-weight: bold;
+        padding: 10px 20px;
+        border-radius: 8px;
+        border: none;
+    }}
+    {hover_selector} {{
+        background: linear-gradient(135deg, {end}, {hover});
+    }}
+"""
+
+# Header-style gradient buttons by (start, end, hover) colour; buttons that
+# share a palette share one rule block
+_HEADER_BUTTON_PALETTES = {
+    ('#4CAF50', '#45a049', '#3e8e41'): ('modelButton', 'uploadButton'),
+    ('#FF6B6B', '#FF5252', '#E53935'): ('apiKeyButton',),
+    ('#4CAF50', '#45a049', '#3d8b40'): ('accessibilityButton',),
+    ('#9C27B0', '#7B1FA2', '#6A1B9A'): ('switchModelButton',),
+    ('#FF9800', '#F57C00', '#EF6C00'): ('viewPdfButton',),
+}
+
+def _gradient_button_qss(names, start, end, hover):
+    """Rule block for header-style gradient buttons with the given objectNames"""
+    return _HEADER_BUTTON_QSS.format(
+        selector=', '.join(f'QPushButton#{name}' for name in names),
+        hover_selector=', '.join(f'QPushButton#{name}:hover' for name in names),
+        start=start, end=end, hover=hover
+    )
+
+_TAB_HEADER_QSS = """
+    QLabel#{name} {{
+        font-size: 20px; 
+        font-weight: bold; 
+        color: #2E86AB; 
+        margin: 10px;
+        padding: 15px;
+        border-radius: 15px;
+        border: 2px solid {border};
+    }}
+"""
+
+_LIST_QSS = """
+    QListView#{name} {{
+        background: {background};
+        border: 2px solid {border};
+        border-radius: 8px;
+        padding: 5px;
+    }}
+    QListView#{name}::item {{
+        padding: {item_padding};
+        border-bottom: 1px solid {separator};
+        border-radius: 5px;
+        margin: 2px;
+    }}
+    QListView#{name}::item:selected {{
+        background: {selected};
+        border: 2px solid {selected_border};
+    }}
+"""
+
+_APP_QSS = """
+    QTabWidget#mainTabs::pane {
+        border: 2px solid #C0C0C0;
+        border-radius: 10px;
+        background: white;
+    }
+    QTabWidget#mainTabs QTabBar::tab {
+        background: #E6F3FF;
+        border: 2px solid #C0C0C0;
+        padding: 10px 20px;
+        margin-right: 2px;
+        border-radius: 8px 8px 0px 0px;
+    }
+    QTabWidget#mainTabs QTabBar::tab:selected {
+        background: #FFE5E5;
+        border-color: #FF69B4;
+        font-weight: bold;
+    }
+    QLabel#appTitle {
+        font-size: 24px; 
+        font-weight: bold; 
+        color: #2E86AB; 
+        margin: 10px;
+        padding: 10px;
+    }
+    QLabel#appSubtitle {
+        font-size: 16px; color: #666; margin: 5px; font-style: italic;
+    }
+    QLabel#complianceLabel {
+        font-size: 12px; color: #4CAF50; margin: 5px; font-weight: bold;
+    }
+    QLabel#mutedLabel {
+        font-size: 12px; color: #666; margin: 5px;
+    }
+    QPlainTextEdit#chatDisplay {
+        background: #FAFAFA;
+        border: 2px solid #E0E0E0;
+        border-radius: 10px;
+        padding: 15px;
+        font-family: 'Segoe UI', sans-serif;
+        font-size: 14px;
+    }
+    QLineEdit#chatInput {
+        padding: 12px;
+        border: 2px solid #D0D0D0;
+        border-radius: 8px;
+        font-size: 14px;
+    }
+    QLineEdit#chatInput:focus {
+        border-color: #FF69B4;
+    }
+    QPushButton#sendButton {
+        background: linear-gradient(135deg, #FF69B4, #FF1493);
+        color: white;
+        font-size: 14px;
+        font-weight: bold;
+        padding: 12px 24px;
+        border-radius: 8px;
+        border: none;
+        min-width: 80px;
+    }
+    QPushButton#sendButton:hover {
+        background: linear-gradient(135deg, #FF1493, #DC143C);
+    }
+    QTableView#notesDisplay {
+        background: white;
+        border: 2px solid #E0E0E0;
+        border-radius: 8px;
+    }
+    QGroupBox#quickActions QPushButton {
+        background: #F0F8FF;
+        border: 2px solid #4169E1;
+        padding: 10px;
+        margin: 2px;
+        border-radius: 8px;
+        text-align: left;
+    }
+    QGroupBox#quickActions QPushButton:hover {
+        background: #E6F3FF;
+    }
+    QPlainTextEdit#pdfViewer {
+        background: white;
+        border: 2px solid #B0BEC5;
+        border-radius: 8px;
+        padding: 10px;
+        font-family: 'Courier New', monospace;
+    }
+    QPushButton#findMatchesButton {
+        background: linear-gradient(135deg, #FF69B4, #FF1493);
+        color: white;
+        font-size: 16px;
+        font-weight: bold;
+        padding: 15px;
+        border-radius: 10px;
+        border: none;
+    }
+    QPushButton#findMatchesButton:hover {
+        background: linear-gradient(135deg, #FF1493, #DC143C);
+    }
+    QTextBrowser#aiAnalysisText {
+        background: #FFF8DC;
+        border: 2px solid #DAA520;
+        border-radius: 8px;
+        padding: 10px;
+        font-family: 'Segoe UI', sans-serif;
+    }
+""" + "".join([
+    *(_gradient_button_qss(names, *palette) for palette, names in _HEADER_BUTTON_PALETTES.items()),
+    _TAB_HEADER_QSS.format(name='chatHeader', border='#FF69B4'),
+    _TAB_HEADER_QSS.format(name='socialWorkerHeader', border='#4CAF50'),
+    _TAB_HEADER_QSS.format(name='documentsHeader', border='#4169E1'),
+    _LIST_QSS.format(name='fileList', background='#FAFAFA', border='#E0E0E0', item_padding='8px',
+                     separator='#D0D0D0', selected='#E3F2FD', selected_border='#2196F3'),
+    _LIST_QSS.format(name='matchingResultsList', background='#F8F9FA', border='#E9ECEF', item_padding='10px',
+                     separator='#DEE2E6', selected='#FFE5E5', selected_border='#FF69B4'),
+    _LIST_QSS.format(name='familyList', background='#F0F8FF', border='#B0C4DE', item_padding='8px',
+                     separator='#D3D3D3', selected='#E6F3FF', selected_border='#4169E1'),
+])
+
+# Chat log entries; only the message text is substituted per turn
+_USER_BUBBLE_HTML = (
+    '<div style="margin: 10px 0; padding: 10px; background: #E3F2FD; border-radius: 10px;">'
+    '<strong>You:</strong> %s</div>'
+)
+_ASSISTANT_BUBBLE_HTML = (
+    '<div style="margin: 10px 0; padding: 10px; background: #E8F5E8; border-radius: 10px;">'
+    '<strong>Assistant:</strong> </div>'
+)
+_CHAT_CLEARED_HTML = (
+    '<div style="text-align: center; margin: 20px; color: #666; font-style: italic;">'
+    '💬 Chat cleared. How can I help you today?</div>'
+)
+
+@functools.lru_cache(maxsize=32)
+def _gradient_pixmap(width, height, start, end):
+    """Diagonal two-colour gradient, rendered once per size and colour pair"""
+    pixmap = QPixmap(width, height)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor(start))
+    gradient.setColorAt(1, QColor(end))
+    painter = QPainter(pixmap)
+    painter.fillRect(pixmap.rect(), gradient)
+    painter.end()
+    return pixmap
+
+class GradientHeaderLabel(QLabel):
+    """Tab header label whose gradient background is a cached pixmap
+    
+    Painting blits the pixmap instead of recomputing the gradient each
+    repaint. The border and text still come from the application stylesheet.
+    """
+    
+    # Must match the margin and border-radius in _TAB_HEADER_QSS, so the
+    # gradient fills only the bordered box and not the margin around it
+    MARGIN = 10
+    RADIUS = 15
+    
+    def __init__(self, text, end_color, start_color='#E6F3FF', parent=None):
+        super().__init__(text, parent)
+        self.start_color = start_color
+        self.end_color = end_color
+    
+    def paintEvent(self, event):
+        box = self.rect().adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        path = QPainterPath()
+        path.addRoundedRect(box.x(), box.y(), box.width(), box.height(), self.RADIUS, self.RADIUS)
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipPath(path)
+        painter.drawPixmap(box.topLeft(), _gradient_pixmap(box.width(), box.height(), self.start_color, self.end_color))
+        painter.end()
+        super().paintEvent(event)
+
+# Compatibility analysis and family details texts, filled with format_map
+_ANALYSIS_TEMPLATE = """
+🤖 AI Compatibility Analysis (Model: {model})
+
+Child Profile:
+• Age: {age} years
+• Interests: {child_interests}
+• Personality: {personality}
+• Special Needs: {special_needs}
+
+Family Profile:
+• Type: {family_type}
+• Age Range: {age_range}
+• Interests: {interests_list}
+• Specializations: {specializations_list}
+• Values: {values}
+
+Match Score: {match_score}%
+
+AI Reasoning:
+{reasoning}
+
+Recommendations:
+• Consider scheduling a supervised meeting
+• Discuss specific needs and expectations
+• Review family's experience with similar situations
+• Plan gradual integration if match proceeds
+"""
+
+_FAMILY_DETAILS_TEMPLATE = """
+👨‍👩‍👧‍👦 Family Details
+
+Family ID: {id}
+Type: {family_type}
+Age Range: {age_range}
+Location: {location}
+
+Interests:
+{interests_bullets}
+
+Specializations:
+{specializations_bullets}
+
+Home Type: {home_type}
+Pets: {pets}
+Values: {values}
+"""
+
+# API key services shown in the status bar, with their display names
+API_KEY_SERVICES = (
+    ('ollama_cloud', 'Ollama Cloud'),
+    ('openai', 'OpenAI'),
+    ('anthropic', 'Anthropic'),
+)
+
+# Selectable models, in the order they appear in the model combo boxes.
+# 'label' is shown in the model selection dialog and 'social_worker_label'
+# in the Social Worker tab's model combo box.
+MODEL_CONFIGS = (
+    {'name': 'mistral:7b', 'display': 'Mistral 7B',
+     'label': "🚀 Mistral 7B (Recommended for Production)",
+     'social_worker_label': "🚀 Mistral 7B (Fast, Real-time Chat)"},
+    {'name': 'qwen2.5:72b', 'display': 'Qwen 72B',
+     'label': "🧠 Qwen 72B (Advanced Reasoning)",
+     'social_worker_label': "🧠 Qwen 72B (Advanced Reasoning)"},
+    {'name': 'qwen3-coder:480b-cloud', 'display': 'Qwen 480B',
+     'label': "⚡ Qwen 480B (Maximum Capability)",
+     'social_worker_label': "⚡ Qwen 480B (Maximum Capability)"},
+    {'name': 'gpt-oss:120b-cloud', 'display': 'GPT-OSS 120B',
+     'label': "🌟 GPT-OSS 120B (Balanced Performance)",
+     'social_worker_label': "🌟 GPT-OSS 120B (Balanced Performance)"},
+    {'name': 'ollama-default', 'display': 'Ollama Default',
+     'label': "🔧 Ollama Default Model",
+     'social_worker_label': "🔧 Ollama Default Model"},
+)
+
+# Chat contexts, in the order they appear in the "Speaking with" combo box
+CHAT_CONTEXTS = (
+    ('child', "👶 Child (Age-appropriate, gentle guidance)"),
+    ('family', "👨‍👩‍👧‍👦 Family (Adoption/foster guidance)"),
+    ('social_worker', "👤 Social Worker (Professional consultation)"),
+    ('general', "💬 General (General support)"),
+)
+
+def model_config_at(index):
+    """Model configuration for a combo box index, defaulting to the first"""
+    if 0 <= index < len(MODEL_CONFIGS):
+        return MODEL_CONFIGS[index]
+    return MODEL_CONFIGS[0]
+
 class ModelSelectionDialog(QDialog):
     """Model selection dialog for choosing AI models"""
     
@@ -122,13 +599,7 @@ class ModelSelectionDialog(QDialog):
         
         # Model selection
         self.model_combo = QComboBox()
-        self.model_combo.addItems([
-            "🚀 Mistral 7B (Recommended for Production)",
-            "🧠 Qwen 72B (Advanced Reasoning)", 
-            "⚡ Qwen 480B (Maximum Capability)",
-            "🌟 GPT-OSS 120B (Balanced Performance)",
-            "🔧 Ollama Default Model"
-        ])
+        self.model_combo.addItems([config['label'] for config in MODEL_CONFIGS])
         models_layout.addWidget(QLabel("Select Model:"))
         models_layout.addWidget(self.model_combo)
         
@@ -157,42 +628,52 @@ class ModelSelectionDialog(QDialog):
         
     def get_selected_model(self):
         """Get the selected model configuration"""
-        index = self.model_combo.currentIndex()
-        model_configs = {
-            0: {'name': 'mistral:7b', 'display': 'Mistral 7B'},
-            1: {'name': 'qwen2.5:72b', 'display': 'Qwen 72B'},
-            2: {'name': 'qwen3-coder:480b-cloud', 'display': 'Qwen 480B'},
-            3: {'name': 'gpt-oss:120b-cloud', 'display': 'GPT-OSS 120B'},
-            4: {'name': 'ollama-default', 'display': 'Ollama Default'}
-        }
-        return model_configs.get(index, model_configs[0])
+        return model_config_at(self.model_combo.currentIndex())
+
+# Chatbot system prompts by conversation context
+_SYSTEM_PROMPTS = {
+    'child': """You are a warm, caring counselor speaking with a child who may be looking for a new home. 
+                Be gentle, encouraging, and age-appropriate. Use simple language and be emotionally supportive.
+                Focus on hope, safety, and helping them feel valued and loved.""",
+    'family': """You are a knowledgeable family counselor helping prospective adoptive/foster families. 
+                Provide thoughtful guidance about the adoption/foster process, child needs, and family preparation.
+                Be encouraging while being realistic about challenges.""",
+    'social_worker': """You are an experienced social work supervisor providing guidance to caseworkers.
+                Offer professional insights about child welfare, family assessment, and best practices in placement decisions.""",
+    'general': """You are a compassionate AI assistant helping with child-family matching.
+                Provide helpful, empathetic responses focused on the wellbeing of children and families.""",
+}
 
 class CompassionateChatbot:
     """Compassionate chatbot for supporting children and families"""
     
-    def __init__(self, model_name='mistral:7b'):
+    def __init__(self, model_name='mistral:7b', session=None):
         self.model_name = model_name
-        self.conversation_history = []
+        # Sliding window of recent turns; older ones drop off automatically
+        self.conversation_history = deque(maxlen=CONVERSATION_HISTORY_LIMIT)
         self.ollama_endpoint = "http://127.0.0.1:11434/api/generate"
+        # Share the matching engine's pooled connections when given
+        self.session = session or create_ollama_session()
+        self.response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
         
-    def generate_response(self, message, context="general"):
-        """Generate compassionate response"""
+    def generate_response(self, message, context="general", on_token=None):
+        """Generate compassionate response
+        
+        When on_token is given the reply is streamed and each piece of text
+        is passed to it as soon as Ollama produces it.
+        """
         try:
             # Add context-specific prompts
-            if context == "child":
-                system_prompt = """You are a warm, caring counselor speaking with a child who may be looking for a new home. 
-                Be gentle, encouraging, and age-appropriate. Use simple language and be emotionally supportive.
-                Focus on hope, safety, and helping them feel valued and loved."""
-            elif context == "family":
-                system_prompt = """You are a knowledgeable family counselor helping prospective adoptive/foster families. 
-                Provide thoughtful guidance about the adoption/foster process, child needs, and family preparation.
-                Be encouraging while being realistic about challenges."""
-            elif context == "social_worker":
-                system_prompt = """You are an experienced social work supervisor providing guidance to caseworkers.
-                Offer professional insights about child welfare, family assessment, and best practices in placement decisions."""
-            else:
-                system_prompt = """You are a compassionate AI assistant helping with child-family matching.
-                Provide helpful, empathetic responses focused on the wellbeing of children and families."""
+            system_prompt = _SYSTEM_PROMPTS.get(context, _SYSTEM_PROMPTS['general'])
+            
+            # Same question in the same context gets the stored answer
+            cache_key = ResponseCache.make_key(self.model_name, context, message)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                if on_token is not None:
+                    on_token(cached)
+                self._remember(message, cached, context)
+                return cached
             
             # Prepare the prompt
             full_prompt = f"{system_prompt}\n\nUser: {message}\n\nAssistant:"
@@ -201,26 +682,26 @@ class CompassionateChatbot:
             payload = {
                 "model": self.model_name,
                 "prompt": full_prompt,
-                "stream": False,
+                "stream": on_token is not None,
                 "options": {
                     "temperature": 0.7,
                     "num_predict": 500
                 }
             }
             
-            response = requests.post(self.ollama_endpoint, json=payload, timeout=120)
+            response = self.session.post(self.ollama_endpoint, data=_json_body(payload), timeout=120,
+                                         stream=on_token is not None)
             if response.status_code == 200:
-                result = response.json()
-                ai_response = result.get('response', 'I apologize, but I had trouble generating a response. Please try again.')
-                
-                # Store conversation
-                self.conversation_history.append({
-                    'user': message,
-                    'assistant': ai_response,
-                    'context': context,
-                    'timestamp': datetime.now().isoformat()
-                })
+                if on_token is None:
+                    ai_response = _json_loads(response.content).get('response')
+                else:
+                    ai_response = self._read_stream(response, on_token)
+                if ai_response:
+                    self.response_cache.set(cache_key, ai_response)
+                else:
+                    ai_response = 'I apologize, but I had trouble generating a response. Please try again.'
                 
+                self._remember(message, ai_response, context)
                 return ai_response
             else:
                 return "I'm having trouble connecting right now. Please check if Ollama is running and try again."
@@ -228,6 +709,46 @@ class CompassionateChatbot:
         except Exception as e:
             logging.error(f"Chatbot error: {e}")
             return "I apologize, but I'm experiencing technical difficulties. Please try again in a moment."
+    
+    def _remember(self, message, ai_response, context):
+        """Store a conversation turn"""
+        self.conversation_history.append({
+            'user': message,
+            'assistant': ai_response,
+            'context': context,
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    def set_model(self, model_name):
+        """Switch the model used for new replies, keeping the conversation"""
+        self.model_name = model_name
+    
+    def clear_cache(self):
+        """Forget stored replies"""
+        self.response_cache.clear()
+    
+    def _read_stream(self, response, on_token):
+        """Forward streamed response pieces to on_token and return the full text"""
+        parts = []
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = _json_loads(line)
+            piece = chunk.get('response', '')
+            if piece:
+                parts.append(piece)
+                on_token(piece)
+            if chunk.get('done'):
+                break
+        return ''.join(parts)
+
+# Profile fields that are hashed before any data leaves the application
+PII_FIELDS = frozenset(['name', 'address', 'phone', 'email', 'ssn'])
+
+@functools.lru_cache(maxsize=4096)
+def _pii_hash(value):
+    """Short SHA-256 tag for a sensitive value; repeats come from the cache"""
+    return hashlib.sha256(value.encode()).hexdigest()[:8]
 
 class PIIProtection:
     """Enhanced PII protection for Massachusetts compliance"""
@@ -238,9 +759,9 @@ class PIIProtection:
         if isinstance(data, dict):
             anonymized = {}
             for key, value in data.items():
-                if key in ['name', 'address', 'phone', 'email', 'ssn']:
+                if key in PII_FIELDS:
                     # Hash sensitive data for matching without exposing PII
-                    anonymized[key] = hashlib.sha256(str(value).encode()).hexdigest()[:8]
+                    anonymized[key] = _pii_hash(str(value))
                 else:
                     anonymized[key] = value
             return anonymized
@@ -257,7 +778,19 @@ class OllamaMatchingEngine:
     
     def __init__(self, model_name='mistral:7b'):
         self.local_endpoint = "http://127.0.0.1:11434/api/generate"
+        self.embed_endpoint = "http://127.0.0.1:11434/api/embed"
         self.current_model = model_name
+        # Reuse TCP connections across calls instead of reconnecting per family
+        self.session = create_ollama_session()
+        self.response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+        # Interest/location features for the shortlist fallback, rebuilt only
+        # when the family data changes
+        self._feature_index = None
+        # Embedding vectors by anonymized family JSON, reused across queries
+        self._family_embeddings = {}
+        self._family_matrix_cache = None
+        # config.json is read once; reload_api_key() picks up later changes
+        self.api_key = self._get_api_key_from_config()
         self.matching_prompts = {
             'child_family': """
             You are a compassionate AI helping match children with loving families.
@@ -288,51 +821,175 @@ class OllamaMatchingEngine:
             - recommendations (specific suggestions)
             """
         }
+        
+        # Split the per-family template around its slots once; each family
+        # then costs two concatenations instead of a full str.format
+        head, tail = self.matching_prompts['child_family'].split('{family_profile}')
+        self._family_prompt_head = head
+        self._family_prompt_tail = tail
     
     def set_model(self, model_name):
         """Set the current AI model"""
         self.current_model = model_name
+        # Replies from the previous model must not be served for the new one
+        self.clear_cache()
+    
+    def clear_cache(self):
+        """Forget stored replies"""
+        self.response_cache.clear()
+    
+    def close(self):
+        """Release pooled connections to Ollama"""
+        self.session.close()
     
     def get_matching_recommendations(self, child_profile, family_profiles):
-        """Get AI-powered matching recommendations"""
+        """Get AI-powered matching recommendations, best match first"""
         try:
-            recommendations = []
+            if not family_profiles:
+                return []
             
-            for family in family_profiles:
-                # Prepare anonymized data for AI analysis
-                child_anon = PIIProtection.anonymize_data(child_profile)
-                family_anon = PIIProtection.anonymize_data(family)
-                
-                # Create matching prompt
-                prompt = self.matching_prompts['child_family'].format(
-                    child_profile=json.dumps(child_anon, indent=2),
-                    family_profile=json.dumps(family_anon, indent=2)
-                )
-                
-                # Call Ollama API
-                response = self._call_ollama_api(prompt)
-                
-                if response:
-                    recommendations.append({
-                        'family_id': family.get('id', 'unknown'),
-                        'match_score': self._extract_score(response),
-                        'reasoning': response,
-                        'timestamp': datetime.now().isoformat()
-                    })
+            # Families that rule this child out on hard constraints never
+            # reach the model
+            eligible = [family for family in family_profiles
+                        if self._is_structurally_compatible(child_profile, family)]
+            if len(eligible) < len(family_profiles):
+                logging.info(f"Pre-filter skipped {len(family_profiles) - len(eligible)} incompatible families")
+            if not eligible:
+                return []
+            
+            # Anonymize every profile once and render the child's part of the
+            # prompt once; only the family JSON differs between calls
+            child_anon = PIIProtection.anonymize_data(child_profile)
+            families_anon = [PIIProtection.anonymize_data(family) for family in eligible]
+            candidates = self._embedding_shortlist(child_anon, families_anon)
+            child_json = prompt_json(child_anon)
             
-            # Sort by match score
-            recommendations.sort(key=lambda x: x['match_score'], reverse=True)
+            # Rank every candidate in one call; anything the batch reply
+            # missed is scored with its own prompt
+            recommendations = self._match_batch(child_json, candidates)
+            scored = {rec['family_id'] for rec in recommendations}
+            remaining = [family_anon for family_anon in candidates
+                         if family_anon.get('id', 'unknown') not in scored]
+            
+            if remaining:
+                prefix = self._family_prompt_head.format(child_profile=child_json)
+                # Families are independent, so their Ollama calls overlap on
+                # the pooled session instead of running one after another
+                workers = min(OLLAMA_POOL_SIZE, len(remaining))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(
+                        lambda family_anon: self._match_family(prefix, family_anon), remaining))
+                recommendations.extend(rec for rec in results if rec)
+            
+            # Only the shortlisted candidates are scored, so this sort is small
+            recommendations.sort(key=itemgetter('match_score'), reverse=True)
             return recommendations
             
         except Exception as e:
             logging.error(f"Matching engine error: {e}")
             return []
     
-    def _call_ollama_api(self, prompt):
+    def _is_structurally_compatible(self, child_profile, family):
+        """Check the hard constraints a family may state for placements
+        
+        Families can list the child ages they accept ('accepted_age_range',
+        e.g. '5-12') and the regions they can take placements from
+        ('accepted_regions'). Constraints a family does not state always pass.
+        """
+        accepted_ages = _parse_age_range(family.get('accepted_age_range'))
+        age = child_profile.get('age')
+        if accepted_ages and isinstance(age, int) and not accepted_ages[0] <= age <= accepted_ages[1]:
+            return False
+        
+        accepted_regions = family.get('accepted_regions')
+        location = child_profile.get('location')
+        if accepted_regions and location and location not in accepted_regions:
+            return False
+        
+        return True
+    
+    def _embedding_shortlist(self, child_anon, family_profiles):
+        """Keep the families whose embeddings are closest to the child's
+        
+        Family embeddings are kept between runs, so a query embeds the child
+        plus any new or changed families in one /api/embed call. If the
+        embedding model is unavailable, families are pre-ranked on interest
+        overlap and location instead.
+        """
+        if len(family_profiles) <= EMBED_TOP_K:
+            return family_profiles
+        
+        family_texts = [json.dumps(family) for family in family_profiles]
+        missing = [text for text in dict.fromkeys(family_texts) if text not in self._family_embeddings]
+        texts = [json.dumps(child_anon)] + missing
+        try:
+            response = self.session.post(self.embed_endpoint,
+                                         data=_json_body({"model": EMBED_MODEL, "input": texts}), timeout=120)
+            if response.status_code != 200:
+                logging.error(f"Ollama embed error: {response.status_code} - {response.text}")
+                return self._feature_shortlist(child_anon, family_profiles)
+            embeddings = _json_loads(response.content).get('embeddings', [])
+        except Exception as e:
+            logging.error(f"Ollama embed error: {e}")
+            return self._feature_shortlist(child_anon, family_profiles)
+        if len(embeddings) != len(texts):
+            return self._feature_shortlist(child_anon, family_profiles)
+        
+        self._family_embeddings.update(zip(missing, embeddings[1:]))
+        ranked = _top_k_by_similarity(embeddings[0], self._family_matrix(family_texts), EMBED_TOP_K)
+        return [family_profiles[i] for i in ranked]
+    
+    def _family_matrix(self, family_texts):
+        """Family embedding vectors for these families, stacked once
+        
+        With NumPy the vectors are packed into one float32 matrix, which is
+        reused for as long as the family set is unchanged.
+        """
+        key = tuple(family_texts)
+        if self._family_matrix_cache is not None and self._family_matrix_cache[0] == key:
+            return self._family_matrix_cache[1]
+        vectors = [self._family_embeddings[text] for text in family_texts]
+        np = _numpy()
+        if np is not None:
+            vectors = np.asarray(vectors, dtype=np.float32)
+        self._family_matrix_cache = (key, vectors)
+        return vectors
+    
+    def _feature_shortlist(self, child_profile, family_profiles):
+        """Keep the families with the best interest/location pre-rank"""
+        if self._feature_index is None or self._feature_index.families != family_profiles:
+            self._feature_index = FamilyFeatureIndex(family_profiles)
+        return self._feature_index.top(child_profile, EMBED_TOP_K)
+    
+    def _match_batch(self, child_json, families_anon):
+        """Score all families with one Ollama call, skipping unusable entries"""
+        response = self._call_ollama_api(batch_match_prompt(child_json, families_anon),
+                                         num_predict=BATCH_TOKENS_PER_FAMILY * len(families_anon))
+        if not response:
+            return []
+        return parse_batch_reply(response, families_anon)
+    
+    def _match_family(self, prompt_prefix, family_anon):
+        """Score one anonymized family with a single Ollama call"""
+        # Create matching prompt
+        prompt = prompt_prefix + prompt_json(family_anon) + self._family_prompt_tail
+        
+        # Call Ollama API
+        response = self._call_ollama_api(prompt)
+        if not response:
+            return None
+        
+        return {
+            'family_id': family_anon.get('id', 'unknown'),
+            'match_score': self._extract_score(response),
+            'reasoning': response,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _call_ollama_api(self, prompt, num_predict=2000):
         """Call local Ollama with specified model"""
         try:
-            # Try to get API key from local config first
-            api_key = self._get_api_key_from_config()
+            api_key = self.api_key
             
             payload = {
                 "model": self.current_model,
@@ -340,18 +997,27 @@ class OllamaMatchingEngine:
                 "stream": False,
                 "options": {
                     "temperature": 0.7,
-                    "num_predict": 2000
+                    "num_predict": num_predict
                 }
             }
             
+            cache_key = ResponseCache.make_key(
+                self.current_model, prompt, json.dumps(payload["options"], sort_keys=True))
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             # Add API key if available
             if api_key:
                 payload["api_key"] = api_key
             
-            response = requests.post(self.local_endpoint, json=payload, timeout=120)
+            response = self.session.post(self.local_endpoint, data=_json_body(payload), timeout=120)
             if response.status_code == 200:
-                result = response.json()
-                return result.get('response', '')
+                result = _json_loads(response.content)
+                reply = result.get('response', '')
+                if reply:
+                    self.response_cache.set(cache_key, reply)
+                return reply
             else:
                 logging.error(f"Ollama error: {response.status_code} - {response.text}")
                 return None
@@ -360,6 +1026,10 @@ class OllamaMatchingEngine:
             logging.error(f"Ollama API error: {e}")
             return None
     
+    def reload_api_key(self):
+        """Re-read the API key after the configuration changes"""
+        self.api_key = self._get_api_key_from_config()
+    
     def _get_api_key_from_config(self):
         """Get API key from local config file"""
         try:
@@ -394,14 +1064,237 @@ class OllamaMatchingEngine:
     def _extract_score(self, response):
         """Extract matching score from AI response"""
         try:
-            import re
-            score_match = re.search(r'score[:\s]*(\d+)', response.lower())
+            score_match = _SCORE_RE.search(response)
             if score_match:
                 return int(score_match.group(1))
             return 50  # Default neutral score
-        except:
+        except (TypeError, ValueError):
             return 50
 
+class ChatSignals(QObject):
+    """Signals a ChatWorker delivers back to the GUI thread"""
+    
+    token_received = pyqtSignal(str)
+    response_ready = pyqtSignal(str)
+    finished = pyqtSignal()
+
+class ChatWorker(QRunnable):
+    """Generate a chatbot reply on the shared thread pool, streaming its text
+    
+    Chat turns are short and frequent, so they reuse pooled threads rather
+    than starting a new QThread per message.
+    """
+    
+    def __init__(self, chatbot, message, context):
+        super().__init__()
+        self.signals = ChatSignals()
+        self.chatbot = chatbot
+        self.message = message
+        self.context = context
+    
+    def run(self):
+        try:
+            response = self.chatbot.generate_response(
+                self.message, self.context, on_token=self.signals.token_received.emit
+            )
+            self.signals.response_ready.emit(response)
+        finally:
+            self.signals.finished.emit()
+
+# Pages extracted before a PDF is first shown; the rest are extracted in
+# the background and appended as the viewer is scrolled towards the end
+PDF_INITIAL_PAGES = 2
+
+def _open_pdf_pages(file_path):
+    """Open a PDF, returning its pages, a text extractor and a close function
+    
+    Uses PyMuPDF, whose extraction runs in compiled code, when installed and
+    falls back to PyPDF2. Both are imported on first use; most sessions never
+    open the Documents tab.
+    """
+    try:
+        import fitz
+    except ImportError:
+        fitz = None
+    
+    if fitz is not None:
+        doc = fitz.open(file_path)
+        return doc, lambda page: page.get_text(), doc.close
+    
+    import PyPDF2
+    file = open(file_path, 'rb')
+    try:
+        reader = PyPDF2.PdfReader(file)
+    except Exception:
+        file.close()
+        raise
+    # Older PyPDF2 releases return None for pages without text
+    return reader.pages, lambda page: page.extract_text() or "", file.close
+
+class PdfDocument:
+    """Page text of a PDF, filled in by the PdfOpenWorker that extracts it
+    
+    The GUI only reads pages already appended to ``pages``; ``finished`` is
+    set once the worker stops, and setting ``cancelled`` stops it early.
+    ``token`` identifies the open request the document belongs to.
+    """
+    
+    def __init__(self, file_path, page_count, token=0):
+        self.file_path = file_path
+        self.token = token
+        self.page_count = page_count
+        self.pages = []
+        self.finished = False
+        self.cancelled = False
+    
+    def close(self):
+        self.cancelled = True
+
+class NotesModel(QAbstractTableModel):
+    """Table model over the social worker's case notes list
+    
+    The view reads rows straight from the list, so adding a note only
+    inserts one row and nothing is copied into per-cell items.
+    """
+    
+    COLUMNS = (('timestamp', "Timestamp"), ('type', "Note Type"), ('content', "Content"))
+    PREVIEW_LENGTH = 100
+    
+    def __init__(self, notes, parent=None):
+        super().__init__(parent)
+        self._notes = notes
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._notes)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._notes[index.row()][self.COLUMNS[index.column()][0]]
+        if role == Qt.DisplayRole:
+            if len(value) > self.PREVIEW_LENGTH:
+                return value[:self.PREVIEW_LENGTH] + "..."
+            return value
+        if role == Qt.ToolTipRole:
+            # Full text, also used by the notes search filter
+            return value
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return super().headerData(section, orientation, role)
+    
+    def append_note(self, note):
+        """Add a note to the list and the end of the table"""
+        row = len(self._notes)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._notes.append(note)
+        self.endInsertRows()
+
+class RecordListModel(QAbstractListModel):
+    """List model over a Python list of records, labelled on demand
+    
+    Replacing the records is a single model reset, and row text is only
+    produced for rows the view actually paints.
+    """
+    
+    def __init__(self, label, parent=None):
+        super().__init__(parent)
+        self._label = label
+        self._records = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return self._label(self._records[index.row()])
+        return None
+    
+    def set_records(self, records):
+        """Show a new list of records"""
+        self.beginResetModel()
+        self._records = records
+        self.endResetModel()
+    
+    def record(self, index):
+        """Record at a view index, or None for an invalid index"""
+        return self._records[index.row()] if index.isValid() else None
+
+class PdfSignals(QObject):
+    """Signals a PdfOpenWorker delivers back to the GUI thread"""
+    
+    document_ready = pyqtSignal(object)
+    pages_extracted = pyqtSignal(object)
+    error = pyqtSignal(int, str)
+
+class PdfOpenWorker(QRunnable):
+    """Open a PDF and extract its page text on the shared thread pool
+    
+    The document is handed to the GUI once its first pages are ready and
+    extraction carries on in the background, so scrolling never has to wait
+    on the PDF library. ``token`` is passed back with the document and any
+    error, so the GUI can drop results from an open it has since replaced.
+    """
+    
+    def __init__(self, file_path, token):
+        super().__init__()
+        self.signals = PdfSignals()
+        self.file_path = file_path
+        self.token = token
+    
+    def run(self):
+        try:
+            pages, extract, close = _open_pdf_pages(self.file_path)
+        except Exception as e:
+            self.signals.error.emit(self.token, str(e))
+            return
+        document = None
+        try:
+            document = PdfDocument(self.file_path, len(pages), self.token)
+            initial_pages = min(PDF_INITIAL_PAGES, document.page_count)
+            if initial_pages == 0:
+                self.signals.document_ready.emit(document)
+            for index in range(document.page_count):
+                if document.cancelled:
+                    break
+                document.pages.append(f"\n--- Page {index + 1} ---\n{extract(pages[index])}")
+                if index + 1 == initial_pages:
+                    self.signals.document_ready.emit(document)
+                elif index + 1 > initial_pages:
+                    self.signals.pages_extracted.emit(document)
+        except Exception as e:
+            self.signals.error.emit(self.token, str(e))
+        finally:
+            close()
+            if document is not None:
+                document.finished = True
+
+class MatchingWorker(QThread):
+    """Run the matching engine off the GUI thread"""
+    
+    results_ready = pyqtSignal(list)
+    error = pyqtSignal(str)
+    
+    def __init__(self, engine, child_profile, family_profiles, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.child_profile = child_profile
+        self.family_profiles = list(family_profiles)
+    
+    def run(self):
+        try:
+            recommendations = self.engine.get_matching_recommendations(
+                self.child_profile, self.family_profiles
+            )
+            self.results_ready.emit(recommendations)
+        except Exception as e:
+            self.error.emit(str(e))
+
 class HeartMatchEnhancedGUI(QMainWindow):
     """Enhanced HeartMatch Child-Family Matching Interface with Chatbot"""
     
@@ -409,9 +1302,31 @@ class HeartMatchEnhancedGUI(QMainWindow):
         super().__init__()
         self.current_model = 'mistral:7b'
         self.matching_engine = OllamaMatchingEngine(self.current_model)
-        self.chatbot = CompassionateChatbot(self.current_model)
+        self.chatbot = CompassionateChatbot(self.current_model, self.matching_engine.session)
+        self.chat_worker = None
+        self._chat_busy = False
+        self.matching_worker = None
+        self._chat_streamed = False
+        self._typing_block = None
+        # PDF open in the Documents viewer and how many of its pages are shown
+        self._pdf_document = None
+        self._pdf_pages_shown = 0
+        # Token of the latest PDF open; results from earlier opens are dropped
+        self._pdf_open_token = 0
+        # Set whenever the child profile or family data changes since the last
+        # matching run; the refresh timer only reports stale results
+        self._dirty = True
         self.current_child = None
         self.family_database = []
+        self.family_by_id = {}
+        # Template fields per family id, built on first view
+        self._family_fields = {}
+        # Bumped on every family data change; part of the match cache key
+        self._family_db_version = 0
+        self._match_cache = OrderedDict()
+        self._pending_match_key = None
+        # Profile the current results were computed for
+        self._last_child_profile = None
         self.matching_results = []
         self.social_worker_notes = []
         
@@ -432,6 +1347,9 @@ class HeartMatchEnhancedGUI(QMainWindow):
         """Open API key management dialog"""
         dialog = open_api_key_dialog(self)
         if dialog.exec_() == QDialog.Accepted:
+            # Keys may have been added or changed; pick them up without a restart
+            self.matching_engine.reload_api_key()
+            self.update_api_key_status()
             if ACCESSIBILITY_AVAILABLE:
                 self.accessibility_manager.announce_action("API key dialog opened")
     
@@ -459,6 +1377,7 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         # Set compassionate color scheme
         self.set_compassionate_theme()
+        self.setStyleSheet(_APP_QSS)
         
         # Create central widget
         central_widget = QWidget()
@@ -473,42 +1392,48 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         # Create tab widget for different views
         self.tab_widget = QTabWidget()
-        self.tab_widget.setStyleSheet("""
-            QTabWidget::pane {
-                border: 2px solid #C0C0C0;
-                border-radius: 10px;
-                background: white;
-            }
-            QTabBar::tab {
-                background: #E6F3FF;
-                border: 2px solid #C0C0C0;
-                padding: 10px 20px;
-                margin-right: 2px;
-                border-radius: 8px 8px 0px 0px;
-            }
-            QTabBar::tab:selected {
-                background: #FFE5E5;
-                border-color: #FF69B4;
-                font-weight: bold;
-            }
-        """)
+        self.tab_widget.setObjectName("mainTabs")
         
-        # Create tabs
+        # Create tabs. The matching tab is shown first and is built now; the
+        # others start as empty pages filled in the first time they are opened
         matching_tab = self.create_matching_tab()
-        chatbot_tab = self.create_chatbot_tab()
-        social_worker_tab = self.create_social_worker_tab()
-        documents_tab = self.create_documents_tab()
-        
         self.tab_widget.addTab(matching_tab, "💕 Child-Family Matching")
-        self.tab_widget.addTab(chatbot_tab, "💬 Compassionate Chat")
-        self.tab_widget.addTab(social_worker_tab, "👥 Social Worker Tools")
-        self.tab_widget.addTab(documents_tab, "📄 Documents & Files")
+        
+        self._tab_builders = {}
+        for builder, title in (
+            (self.create_chatbot_tab, "💬 Compassionate Chat"),
+            (self.create_social_worker_tab, "👥 Social Worker Tools"),
+            (self.create_documents_tab, "📄 Documents & Files"),
+        ):
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self._tab_builders[self.tab_widget.addTab(page, title)] = builder
+        self.tab_widget.currentChanged.connect(self._ensure_tab_built)
         
         main_layout.addWidget(self.tab_widget)
         
         # Status bar
         self.statusBar().showMessage("HeartMatch Enhanced System Ready - Helping Children Find Loving Homes")
     
+    def _make_button(self, text, handler, object_name=None):
+        """Create a push button wired to handler
+        
+        Styled buttons only get an objectName; their look comes from the
+        application stylesheet.
+        """
+        button = QPushButton(text)
+        if object_name:
+            button.setObjectName(object_name)
+        button.clicked.connect(handler)
+        return button
+    
+    def _ensure_tab_built(self, index):
+        """Build a tab's contents the first time it is selected"""
+        builder = self._tab_builders.pop(index, None)
+        if builder is not None:
+            self.tab_widget.widget(index).layout().addWidget(builder())
+    
     def set_compassionate_theme(self):
         """Set a warm, compassionate color theme"""
         palette = QPalette()
@@ -537,34 +1462,13 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         # Main title
         title = QLabel("🏠 HeartMatch Enhanced - Child-Family Matching System")
-        title.setStyleSheet("""
-            font-size: 24px; 
-            font-weight: bold; 
-            color: #2E86AB; 
-            margin: 10px;
-            padding: 10px;
-        """)
+        title.setObjectName("appTitle")
         title_row.addWidget(title)
         
         title_row.addStretch()
         
         # Model selection button
-        self.model_button = QPushButton("🤖 Select AI Model")
-        self.model_button.setStyleSheet("""
-            QPushButton {
-                background: linear-gradient(135deg, #4CAF50, #45a049);
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-radius: 8px;
-                border: none;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #45a049, #3e8e41);
-            }
-        """)
-        self.model_button.clicked.connect(self.select_model)
+        self.model_button = self._make_button("🤖 Select AI Model", self.select_model, "modelButton")
         title_row.addWidget(self.model_button)
         
         # API Key Manager button
@@ -576,20 +1480,7 @@ class HeartMatchEnhancedGUI(QMainWindow):
             )
         else:
             self.api_key_button = APIKeyButton()
-        self.api_key_button.setStyleSheet("""
-            QPushButton {
-                background: linear-gradient(135deg, #FF6B6B, #FF5252);
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-radius: 8px;
-                border: none;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #FF5252, #E53935);
-            }
-        """)
+        self.api_key_button.setObjectName("apiKeyButton")
         self.api_key_button.clicked.connect(self.open_api_key_dialog)
         title_row.addWidget(self.api_key_button)
         
@@ -604,26 +1495,13 @@ class HeartMatchEnhancedGUI(QMainWindow):
             self.accessibility_button = QPushButton("♿ Accessibility", self)
             self.accessibility_button.setAccessibleName("Accessibility Settings")
             self.accessibility_button.setAccessibleDescription("Configure accessibility settings")
-        self.accessibility_button.setStyleSheet("""
-            QPushButton {
-                background: linear-gradient(135deg, #4CAF50, #45a049);
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-radius: 8px;
-                border: none;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #45a049, #3d8b40);
-            }
-        """)
+        self.accessibility_button.setObjectName("accessibilityButton")
         self.accessibility_button.clicked.connect(self.open_accessibility_settings)
         title_row.addWidget(self.accessibility_button)
         
         # Current model display
         self.current_model_label = QLabel(f"Current: {self.current_model}")
-        self.current_model_label.setStyleSheet("font-size: 12px; color: #666; margin: 5px;")
+        self.current_model_label.setObjectName("mutedLabel")
         title_row.addWidget(self.current_model_label)
         
         header_layout.addLayout(title_row)
@@ -632,13 +1510,13 @@ class HeartMatchEnhancedGUI(QMainWindow):
         info_row = QHBoxLayout()
         
         subtitle = QLabel("AI-Powered Compassionate Matching with Social Worker Support")
-        subtitle.setStyleSheet("font-size: 16px; color: #666; margin: 5px; font-style: italic;")
+        subtitle.setObjectName("appSubtitle")
         info_row.addWidget(subtitle)
         
         info_row.addStretch()
         
         compliance_label = QLabel("🔒 PII Compliant - Massachusetts DCF Standards | © 2025 HeartMatch")
-        compliance_label.setStyleSheet("font-size: 12px; color: #4CAF50; margin: 5px; font-weight: bold;")
+        compliance_label.setObjectName("complianceLabel")
         info_row.addWidget(compliance_label)
         
         header_layout.addLayout(info_row)
@@ -652,32 +1530,17 @@ class HeartMatchEnhancedGUI(QMainWindow):
             model_config = dialog.get_selected_model()
             self.current_model = model_config['name']
             self.matching_engine.set_model(self.current_model)
-            self.chatbot = CompassionateChatbot(self.current_model)
+            self.chatbot.set_model(self.current_model)
             self.current_model_label.setText(f"Current: {model_config['display']}")
             self.statusBar().showMessage(f"✅ Switched to {model_config['display']} model")
     
-    def on_api_key_saved(self, key_type, status):
-        """Handle API key saved event"""
-        if status == "saved":
-            self.statusBar().showMessage(f"✅ API key saved successfully!")
-            # Update any components that might need the API key
-            self.update_api_key_status()
-    
     def update_api_key_status(self):
         """Update API key status in the interface"""
         # Check if we have API keys available
-        has_ollama = has_api_key('ollama_cloud')
-        has_openai = has_api_key('openai')
-        has_anthropic = has_api_key('anthropic')
+        configured = {service for service, _ in API_KEY_SERVICES if has_api_key(service)}
         
         # Update status bar with API key availability
-        api_status = []
-        if has_ollama:
-            api_status.append("Ollama Cloud ✅")
-        if has_openai:
-            api_status.append("OpenAI ✅")
-        if has_anthropic:
-            api_status.append("Anthropic ✅")
+        api_status = [f"{label} ✅" for service, label in API_KEY_SERVICES if service in configured]
         
         if api_status:
             self.statusBar().showMessage(f"🔐 API Keys: {', '.join(api_status)}")
@@ -712,17 +1575,8 @@ class HeartMatchEnhancedGUI(QMainWindow):
         layout = QVBoxLayout(tab)
         
         # Header
-        header = QLabel("💬 Compassionate AI Assistant")
-        header.setStyleSheet("""
-            font-size: 20px; 
-            font-weight: bold; 
-            color: #2E86AB; 
-            margin: 10px;
-            padding: 15px;
-            background: linear-gradient(135deg, #E6F3FF, #FFE5E5);
-            border-radius: 15px;
-            border: 2px solid #FF69B4;
-        """)
+        header = GradientHeaderLabel("💬 Compassionate AI Assistant", '#FFE5E5')
+        header.setObjectName("chatHeader")
         header.setAlignment(Qt.AlignCenter)
         layout.addWidget(header)
         
@@ -731,38 +1585,24 @@ class HeartMatchEnhancedGUI(QMainWindow):
         context_layout.addWidget(QLabel("Speaking with:"))
         
         self.chat_context = QComboBox()
-        self.chat_context.addItems([
-            "👶 Child (Age-appropriate, gentle guidance)",
-            "👨‍👩‍👧‍👦 Family (Adoption/foster guidance)",
-            "👤 Social Worker (Professional consultation)",
-            "💬 General (General support)"
-        ])
+        self.chat_context.addItems([label for _, label in CHAT_CONTEXTS])
         context_layout.addWidget(self.chat_context)
         context_layout.addStretch()
         
         # Clear and export buttons
-        clear_btn = QPushButton("🔄 Clear Chat")
-        clear_btn.clicked.connect(self.clear_chat)
+        clear_btn = self._make_button("🔄 Clear Chat", self.clear_chat)
         context_layout.addWidget(clear_btn)
         
-        export_btn = QPushButton("📄 Export Chat")
-        export_btn.clicked.connect(self.export_chat)
+        export_btn = self._make_button("📄 Export Chat", self.export_chat)
         context_layout.addWidget(export_btn)
         
         layout.addLayout(context_layout)
         
-        # Chat display
-        self.chat_display = QTextBrowser()
-        self.chat_display.setStyleSheet("""
-            QTextBrowser {
-                background: #FAFAFA;
-                border: 2px solid #E0E0E0;
-                border-radius: 10px;
-                padding: 15px;
-                font-family: 'Segoe UI', sans-serif;
-                font-size: 14px;
-            }
-        """)
+        # Chat display; append-only, so a plain text view keeps appends cheap
+        # however long the conversation gets
+        self.chat_display = QPlainTextEdit()
+        self.chat_display.setReadOnly(True)
+        self.chat_display.setObjectName("chatDisplay")
         layout.addWidget(self.chat_display)
         
         # Chat input
@@ -770,37 +1610,11 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         self.chat_input = QLineEdit()
         self.chat_input.setPlaceholderText("Type your message here... 💬")
-        self.chat_input.setStyleSheet("""
-            QLineEdit {
-                padding: 12px;
-                border: 2px solid #D0D0D0;
-                border-radius: 8px;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border-color: #FF69B4;
-            }
-        """)
+        self.chat_input.setObjectName("chatInput")
         self.chat_input.returnPressed.connect(self.send_chat_message)
         input_layout.addWidget(self.chat_input)
         
-        send_btn = QPushButton("💌 Send")
-        send_btn.setStyleSheet("""
-            QPushButton {
-                background: linear-gradient(135deg, #FF69B4, #FF1493);
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 12px 24px;
-                border-radius: 8px;
-                border: none;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #FF1493, #DC143C);
-            }
-        """)
-        send_btn.clicked.connect(self.send_chat_message)
+        send_btn = self._make_button("💌 Send", self.send_chat_message, "sendButton")
         input_layout.addWidget(send_btn)
         
         layout.addLayout(input_layout)
@@ -813,17 +1627,8 @@ class HeartMatchEnhancedGUI(QMainWindow):
         layout = QVBoxLayout(tab)
         
         # Header
-        header = QLabel("👥 Social Worker Collaboration Tools")
-        header.setStyleSheet("""
-            font-size: 20px; 
-            font-weight: bold; 
-            color: #2E86AB; 
-            margin: 10px;
-            padding: 15px;
-            background: linear-gradient(135deg, #E6F3FF, #D4E6B7);
-            border-radius: 15px;
-            border: 2px solid #4CAF50;
-        """)
+        header = GradientHeaderLabel("👥 Social Worker Collaboration Tools", '#D4E6B7')
+        header.setObjectName("socialWorkerHeader")
         header.setAlignment(Qt.AlignCenter)
         layout.addWidget(header)
         
@@ -836,28 +1641,35 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         # Notes controls
         notes_controls = QHBoxLayout()
-        add_note_btn = QPushButton("➕ Add Note")
-        add_note_btn.clicked.connect(self.add_social_worker_note)
+        add_note_btn = self._make_button("➕ Add Note", self.add_social_worker_note)
         notes_controls.addWidget(add_note_btn)
         
-        save_notes_btn = QPushButton("💾 Save Notes")
-        save_notes_btn.clicked.connect(self.save_social_worker_notes)
+        save_notes_btn = self._make_button("💾 Save Notes", self.save_social_worker_notes)
         notes_controls.addWidget(save_notes_btn)
         notes_controls.addStretch()
         
+        # Search filters on every column
+        self.notes_search = QLineEdit()
+        self.notes_search.setPlaceholderText("🔍 Search notes...")
+        notes_controls.addWidget(self.notes_search)
+        
         notes_layout.addLayout(notes_controls)
         
-        # Notes display
-        self.notes_display = QTableWidget()
-        self.notes_display.setColumnCount(3)
-        self.notes_display.setHorizontalHeaderLabels(["Timestamp", "Note Type", "Content"])
-        self.notes_display.setStyleSheet("""
-            QTableWidget {
-                background: white;
-                border: 2px solid #E0E0E0;
-                border-radius: 8px;
-            }
-        """)
+        # Notes display, reading from the notes list through a filterable proxy
+        self.notes_model = NotesModel(self.social_worker_notes, self)
+        self.notes_proxy = QSortFilterProxyModel(self)
+        self.notes_proxy.setSourceModel(self.notes_model)
+        self.notes_proxy.setFilterKeyColumn(-1)
+        # The display text is a truncated preview; search the full note instead
+        self.notes_proxy.setFilterRole(Qt.ToolTipRole)
+        self.notes_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.notes_search.textChanged.connect(self.notes_proxy.setFilterFixedString)
+        
+        self.notes_display = QTableView()
+        self.notes_display.setModel(self.notes_proxy)
+        self.notes_display.setSortingEnabled(True)
+        self.notes_display.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.notes_display.setObjectName("notesDisplay")
         notes_layout.addWidget(self.notes_display)
         
         tools_layout.addWidget(notes_group)
@@ -868,38 +1680,17 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         # Model selection dropdown
         self.social_worker_model_combo = QComboBox()
-        self.social_worker_model_combo.addItems([
-            "🚀 Mistral 7B (Fast, Real-time Chat)",
-            "🧠 Qwen 72B (Advanced Reasoning)", 
-            "⚡ Qwen 480B (Maximum Capability)",
-            "🌟 GPT-OSS 120B (Balanced Performance)",
-            "🔧 Ollama Default Model"
-        ])
+        self.social_worker_model_combo.addItems([config['social_worker_label'] for config in MODEL_CONFIGS])
         model_layout.addWidget(QLabel("Select AI Model for Social Worker Tasks:"))
         model_layout.addWidget(self.social_worker_model_combo)
         
         # Model switch button
-        switch_model_btn = QPushButton("🔄 Switch Model")
-        switch_model_btn.setStyleSheet("""
-            QPushButton {
-                background: linear-gradient(135deg, #9C27B0, #7B1FA2);
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-radius: 8px;
-                border: none;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #7B1FA2, #6A1B9A);
-            }
-        """)
-        switch_model_btn.clicked.connect(self.switch_social_worker_model)
+        switch_model_btn = self._make_button("🔄 Switch Model", self.switch_social_worker_model, "switchModelButton")
         model_layout.addWidget(switch_model_btn)
         
         # Current model display
         self.social_worker_current_model = QLabel(f"Current: {self.current_model}")
-        self.social_worker_current_model.setStyleSheet("font-size: 12px; color: #666; margin: 5px;")
+        self.social_worker_current_model.setObjectName("mutedLabel")
         model_layout.addWidget(self.social_worker_current_model)
         
         tools_layout.addWidget(model_group)
@@ -918,23 +1709,10 @@ class HeartMatchEnhancedGUI(QMainWindow):
             ("🎓 Educational Needs Analysis", self.educational_needs_analysis),
         ]
         
+        # The app stylesheet styles every action button in this group
+        actions_group.setObjectName("quickActions")
         for text, handler in actions:
-            btn = QPushButton(text)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background: #F0F8FF;
-                    border: 2px solid #4169E1;
-                    padding: 10px;
-                    margin: 2px;
-                    border-radius: 8px;
-                    text-align: left;
-                }
-                QPushButton:hover {
-                    background: #E6F3FF;
-                }
-            """)
-            btn.clicked.connect(handler)
-            actions_layout.addWidget(btn)
+            actions_layout.addWidget(self._make_button(text, handler))
         
         actions_layout.addStretch()
         tools_layout.addWidget(actions_group)
@@ -948,75 +1726,94 @@ class HeartMatchEnhancedGUI(QMainWindow):
         message = self.chat_input.text().strip()
         if not message:
             return
+        if self._chat_busy:
+            return
         
         # Get context
-        context_map = {
-            0: "child",
-            1: "family", 
-            2: "social_worker",
-            3: "general"
-        }
-        context = context_map.get(self.chat_context.currentIndex(), "general")
-        
-        # Display user message
-        self.chat_display.append(f"""
-        <div style="margin: 10px 0; padding: 10px; background: #E3F2FD; border-radius: 10px;">
-        <strong>You:</strong> {message}
-        </div>
-        """)
+        index = self.chat_context.currentIndex()
+        context = CHAT_CONTEXTS[index][0] if 0 <= index < len(CHAT_CONTEXTS) else "general"
         
         # Clear input
         self.chat_input.clear()
         
-        # Show typing indicator
-        self.chat_display.append("""
-        <div style="margin: 10px 0; padding: 10px; background: #FFF3E0; border-radius: 10px; font-style: italic;">
-        <strong>Assistant:</strong> <em>Thinking...</em> 🤔
-        </div>
-        """)
-        
-        # Move cursor to end
-        cursor = self.chat_display.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.chat_display.setTextCursor(cursor)
-        
-        # Process message and get response
-        QApplication.processEvents()  # Update UI
-        
+        # Add the turn with repaints held, so the view redraws once at the end
+        self.chat_display.setUpdatesEnabled(False)
         try:
-            response = self.chatbot.generate_response(message, context)
-            
-            # Remove typing indicator and add response
-            self.chat_display.undo()  # Remove typing indicator
-            
-            self.chat_display.append(f"""
-            <div style="margin: 10px 0; padding: 10px; background: #E8F5E8; border-radius: 10px;">
-            <strong>Assistant:</strong> {response}
-            </div>
-            """)
+            # Display user message
+            # Escaped so text like '<' in the message can't break the log's markup
+            self.chat_display.appendHtml(_USER_BUBBLE_HTML % html.escape(message))
             
-        except Exception as e:
-            self.chat_display.undo()  # Remove typing indicator
-            self.chat_display.append(f"""
-            <div style="margin: 10px 0; padding: 10px; background: #FFEBEE; border-radius: 10px;">
-            <strong>Assistant:</strong> I apologize, but I'm having technical difficulties. Please ensure Ollama is running and try again.
-            </div>
-            """)
-        
-        # Move cursor to end
-        cursor = self.chat_display.textCursor()
+            # Open the assistant reply; streamed text is added to it as it arrives
+            self.chat_display.appendHtml(_ASSISTANT_BUBBLE_HTML)
+            # Typing indicator in its own block, removed directly when text arrives
+            self.chat_display.appendPlainText("Thinking... 🤔")
+            self._typing_block = self.chat_display.blockCount() - 1
+        finally:
+            self.chat_display.setUpdatesEnabled(True)
+        self._scroll_chat_to_end()
+        self.statusBar().showMessage("🤔 Assistant is thinking...")
+        
+        # Generate the reply in the background so the window stays responsive
+        self._chat_streamed = False
+        self.chat_input.setEnabled(False)
+        self._chat_busy = True
+        self.chat_worker = ChatWorker(self.chatbot, message, context)
+        self.chat_worker.signals.token_received.connect(self.on_chat_token)
+        self.chat_worker.signals.response_ready.connect(self.on_chat_response)
+        self.chat_worker.signals.finished.connect(self.on_chat_finished)
+        QThreadPool.globalInstance().start(self.chat_worker)
+    
+    def on_chat_token(self, token):
+        """Append a streamed piece of the assistant reply"""
+        self._chat_streamed = True
+        self._remove_typing_indicator()
+        # Edit the document directly; the widget's own cursor stays put
+        cursor = QTextCursor(self.chat_display.document())
         cursor.movePosition(QTextCursor.End)
-        self.chat_display.setTextCursor(cursor)
+        # Plain format so the reply doesn't inherit the bold 'Assistant:' label
+        cursor.insertText(token, QTextCharFormat())
+        self._scroll_chat_to_end()
+    
+    def on_chat_response(self, response):
+        """Show the reply if nothing was streamed (e.g. a connection error)"""
+        if not self._chat_streamed:
+            self.on_chat_token(response)
+        self.statusBar().clearMessage()
+    
+    def on_chat_finished(self):
+        """Re-enable chat input once the reply is complete"""
+        self._chat_busy = False
+        self.chat_input.setEnabled(True)
+        self.chat_input.setFocus()
+    
+    def _remove_typing_indicator(self):
+        """Delete the typing indicator block, if it is still shown"""
+        if self._typing_block is None:
+            return
+        block = self.chat_display.document().findBlockByNumber(self._typing_block)
+        self._typing_block = None
+        if block.isValid():
+            # BlockUnderCursor takes the preceding separator too, so the reply
+            # continues on the 'Assistant:' line
+            cursor = QTextCursor(block)
+            cursor.select(QTextCursor.BlockUnderCursor)
+            cursor.removeSelectedText()
+    
+    def _scroll_chat_to_end(self):
+        """Scroll the chat log to its latest entry"""
+        scroll_bar = self.chat_display.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
     
     def clear_chat(self):
         """Clear chat history"""
-        self.chat_display.clear()
-        self.chatbot.conversation_history = []
-        self.chat_display.append("""
-        <div style="text-align: center; margin: 20px; color: #666; font-style: italic;">
-        💬 Chat cleared. How can I help you today?
-        </div>
-        """)
+        self._typing_block = None
+        self.chatbot.conversation_history.clear()
+        self.chat_display.setUpdatesEnabled(False)
+        try:
+            self.chat_display.clear()
+            self.chat_display.appendHtml(_CHAT_CLEARED_HTML)
+        finally:
+            self.chat_display.setUpdatesEnabled(True)
     
     def export_chat(self):
         """Export chat conversation"""
@@ -1026,8 +1823,7 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         try:
             filename = f"HeartMatch_Chat_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, 'w') as f:
-                json.dump(self.chatbot.conversation_history, f, indent=2)
+            _write_json_file(filename, list(self.chatbot.conversation_history))
             QMessageBox.information(self, "Export Complete", f"Chat exported to {filename}")
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to export chat: {str(e)}")
@@ -1041,23 +1837,13 @@ class HeartMatchEnhancedGUI(QMainWindow):
                 'type': 'Case Note',
                 'content': note_text
             }
-            self.social_worker_notes.append(note)
-            self.refresh_notes_display()
-    
-    def refresh_notes_display(self):
-        """Refresh the notes display table"""
-        self.notes_display.setRowCount(len(self.social_worker_notes))
-        for i, note in enumerate(self.social_worker_notes):
-            self.notes_display.setItem(i, 0, QTableWidgetItem(note['timestamp']))
-            self.notes_display.setItem(i, 1, QTableWidgetItem(note['type']))
-            self.notes_display.setItem(i, 2, QTableWidgetItem(note['content'][:100] + "..." if len(note['content']) > 100 else note['content']))
+            self.notes_model.append_note(note)
     
     def save_social_worker_notes(self):
         """Save social worker notes to file"""
         try:
             filename = f"HeartMatch_SocialWorker_Notes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, 'w') as f:
-                json.dump(self.social_worker_notes, f, indent=2)
+            _write_json_file(filename, self.social_worker_notes)
             QMessageBox.information(self, "Notes Saved", f"Notes saved to {filename}")
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Failed to save notes: {str(e)}")
@@ -1083,19 +1869,10 @@ class HeartMatchEnhancedGUI(QMainWindow):
     
     def switch_social_worker_model(self):
         """Switch AI model for social worker tasks"""
-        index = self.social_worker_model_combo.currentIndex()
-        model_configs = {
-            0: {'name': 'mistral:7b', 'display': 'Mistral 7B'},
-            1: {'name': 'qwen2.5:72b', 'display': 'Qwen 72B'},
-            2: {'name': 'qwen3-coder:480b-cloud', 'display': 'Qwen 480B'},
-            3: {'name': 'gpt-oss:120b-cloud', 'display': 'GPT-OSS 120B'},
-            4: {'name': 'ollama-default', 'display': 'Ollama Default'}
-        }
-        
-        model_config = model_configs.get(index, model_configs[0])
+        model_config = model_config_at(self.social_worker_model_combo.currentIndex())
         self.current_model = model_config['name']
         self.matching_engine.set_model(self.current_model)
-        self.chatbot = CompassionateChatbot(self.current_model)
+        self.chatbot.set_model(self.current_model)
         
         # Update displays
         self.current_model_label.setText(f"Current: {model_config['display']}")
@@ -1116,17 +1893,8 @@ class HeartMatchEnhancedGUI(QMainWindow):
         layout = QVBoxLayout(tab)
         
         # Header
-        header = QLabel("📄 Documents & File Management")
-        header.setStyleSheet("""
-            font-size: 20px; 
-            font-weight: bold; 
-            color: #2E86AB; 
-            margin: 10px;
-            padding: 15px;
-            background: linear-gradient(135deg, #E6F3FF, #F0F8FF);
-            border-radius: 15px;
-            border: 2px solid #4169E1;
-        """)
+        header = GradientHeaderLabel("📄 Documents & File Management", '#F0F8FF')
+        header.setObjectName("documentsHeader")
         header.setAlignment(Qt.AlignCenter)
         layout.addWidget(header)
         
@@ -1137,40 +1905,10 @@ class HeartMatchEnhancedGUI(QMainWindow):
         # File upload controls
         upload_layout = QHBoxLayout()
         
-        self.upload_button = QPushButton("📤 Upload File")
-        self.upload_button.setStyleSheet("""
-            QPushButton {
-                background: linear-gradient(135deg, #4CAF50, #45a049);
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-radius: 8px;
-                border: none;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #45a049, #3e8e41);
-            }
-        """)
-        self.upload_button.clicked.connect(self.upload_file)
+        self.upload_button = self._make_button("📤 Upload File", self.upload_file, "uploadButton")
         upload_layout.addWidget(self.upload_button)
         
-        self.view_pdf_button = QPushButton("📄 View PDF")
-        self.view_pdf_button.setStyleSheet("""
-            QPushButton {
-                background: linear-gradient(135deg, #FF9800, #F57C00);
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-radius: 8px;
-                border: none;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #F57C00, #EF6C00);
-            }
-        """)
-        self.view_pdf_button.clicked.connect(self.view_pdf)
+        self.view_pdf_button = self._make_button("📄 View PDF", self.view_pdf, "viewPdfButton")
         upload_layout.addWidget(self.view_pdf_button)
         
         upload_layout.addStretch()
@@ -1178,24 +1916,7 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         # File list
         self.file_list = QListWidget()
-        self.file_list.setStyleSheet("""
-            QListWidget {
-                background: #FAFAFA;
-                border: 2px solid #E0E0E0;
-                border-radius: 8px;
-                padding: 5px;
-            }
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #D0D0D0;
-                border-radius: 5px;
-                margin: 2px;
-            }
-            QListWidget::item:selected {
-                background: #E3F2FD;
-                border: 2px solid #2196F3;
-            }
-        """)
+        self.file_list.setObjectName("fileList")
         file_layout.addWidget(self.file_list)
         
         layout.addWidget(file_group)
@@ -1205,28 +1926,23 @@ class HeartMatchEnhancedGUI(QMainWindow):
         pdf_layout = QVBoxLayout(pdf_group)
         
         # PDF viewer
-        self.pdf_viewer = QTextBrowser()
-        self.pdf_viewer.setStyleSheet("""
-            QTextBrowser {
-                background: white;
-                border: 2px solid #B0BEC5;
-                border-radius: 8px;
-                padding: 10px;
-                font-family: 'Courier New', monospace;
-            }
-        """)
+        self.pdf_viewer = QPlainTextEdit()
+        self.pdf_viewer.setReadOnly(True)
+        self.pdf_viewer.setObjectName("pdfViewer")
         self.pdf_viewer.setPlaceholderText("Select a PDF file to view its contents...")
+        # Pages are appended near the end of the text, and also while the text
+        # is too short to scroll at all
+        self.pdf_viewer.verticalScrollBar().valueChanged.connect(self.on_pdf_scrolled)
+        self.pdf_viewer.verticalScrollBar().rangeChanged.connect(self.on_pdf_scrolled)
         pdf_layout.addWidget(self.pdf_viewer)
         
         # PDF controls
         pdf_controls = QHBoxLayout()
         
-        self.extract_text_button = QPushButton("📝 Extract Text")
-        self.extract_text_button.clicked.connect(self.extract_pdf_text)
+        self.extract_text_button = self._make_button("📝 Extract Text", self.extract_pdf_text)
         pdf_controls.addWidget(self.extract_text_button)
         
-        self.save_pdf_button = QPushButton("💾 Save PDF")
-        self.save_pdf_button.clicked.connect(self.save_pdf)
+        self.save_pdf_button = self._make_button("💾 Save PDF", self.save_pdf)
         pdf_controls.addWidget(self.save_pdf_button)
         
         pdf_controls.addStretch()
@@ -1247,14 +1963,16 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         if file_path:
             try:
-                # Get file info
-                file_name = os.path.basename(file_path)
-                file_size = os.path.getsize(file_path)
+                # Get file info; QFileInfo stats the file once and caches it
+                file_info = QFileInfo(file_path)
+                if not file_info.exists():
+                    raise FileNotFoundError(file_path)
+                file_name = file_info.fileName()
                 
-                # Add to file list
-                item_text = f"{file_name} ({file_size} bytes)"
+                # Add to file list, keeping the file info for later use
+                item_text = f"{file_name} ({file_info.size()} bytes)"
                 item = QListWidgetItem(item_text)
-                item.setData(Qt.UserRole, file_path)
+                item.setData(Qt.UserRole, file_info)
                 self.file_list.addItem(item)
                 
                 self.statusBar().showMessage(f"✅ File uploaded: {file_name}")
@@ -1269,28 +1987,72 @@ class HeartMatchEnhancedGUI(QMainWindow):
             QMessageBox.information(self, "No File Selected", "Please select a PDF file to view.")
             return
         
-        file_path = current_item.data(Qt.UserRole)
-        if not file_path.endswith('.pdf'):
+        file_info = current_item.data(Qt.UserRole)
+        if file_info.suffix().lower() != 'pdf':
             QMessageBox.warning(self, "Invalid File", "Please select a PDF file.")
             return
-        
-        try:
-            # Extract text from PDF
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text_content = ""
-                
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text_content += f"\n--- Page {page_num + 1} ---\n"
-                    text_content += page.extract_text()
-                
-                # Display in PDF viewer
-                self.pdf_viewer.setPlainText(text_content)
-                self.statusBar().showMessage(f"✅ PDF loaded: {os.path.basename(file_path)}")
-                
-        except Exception as e:
-            QMessageBox.critical(self, "PDF Error", f"Failed to read PDF: {str(e)}")
+        file_path = file_info.absoluteFilePath()
+        
+        # Open the PDF off the GUI thread
+        self.statusBar().showMessage(f"📄 Loading PDF: {file_info.fileName()}...")
+        self._pdf_open_token += 1
+        worker = PdfOpenWorker(file_path, self._pdf_open_token)
+        worker.signals.document_ready.connect(self.on_pdf_document_ready)
+        worker.signals.pages_extracted.connect(self.on_pdf_pages_extracted)
+        worker.signals.error.connect(self.on_pdf_error)
+        QThreadPool.globalInstance().start(worker)
+    
+    def on_pdf_document_ready(self, document):
+        """Show the first pages of a newly opened PDF"""
+        if document.token != self._pdf_open_token:
+            # A later open has replaced this one; stop its extraction
+            document.close()
+            return
+        self._close_pdf_document()
+        self._pdf_document = document
+        self._pdf_pages_shown = len(document.pages)
+        self.pdf_viewer.setPlainText("".join(document.pages))
+        self.statusBar().showMessage(
+            f"✅ PDF loaded: {os.path.basename(document.file_path)} ({document.page_count} pages)"
+        )
+        self.on_pdf_scrolled()
+    
+    def on_pdf_pages_extracted(self, document):
+        """Show newly extracted pages if the viewer is waiting for them"""
+        if document is self._pdf_document:
+            self.on_pdf_scrolled()
+    
+    def on_pdf_scrolled(self, *args):
+        """Append the next page once the viewer is scrolled near the end"""
+        scroll_bar = self.pdf_viewer.verticalScrollBar()
+        if scroll_bar.value() >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self._show_more_pdf_pages(1)
+    
+    def _show_more_pdf_pages(self, count=None):
+        """Append up to count more extracted pages, or all extracted ones"""
+        document = self._pdf_document
+        if document is None:
+            return
+        available = len(document.pages)
+        end = available if count is None else min(self._pdf_pages_shown + count, available)
+        if end <= self._pdf_pages_shown:
+            return
+        cursor = QTextCursor(self.pdf_viewer.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText("".join(document.pages[self._pdf_pages_shown:end]))
+        self._pdf_pages_shown = end
+    
+    def _close_pdf_document(self):
+        if self._pdf_document is not None:
+            self._pdf_document.close()
+            self._pdf_document = None
+    
+    def on_pdf_error(self, token, error_message):
+        """Report a PDF that could not be read"""
+        if token != self._pdf_open_token:
+            return
+        self.statusBar().showMessage("❌ PDF could not be loaded")
+        QMessageBox.critical(self, "PDF Error", f"Failed to read PDF: {error_message}")
     
     def extract_pdf_text(self):
         """Extract text from PDF and show in viewer"""
@@ -1298,6 +2060,13 @@ class HeartMatchEnhancedGUI(QMainWindow):
     
     def save_pdf(self):
         """Save PDF content"""
+        # Pages not yet scrolled into view are saved too
+        document = self._pdf_document
+        if document is not None and not document.finished:
+            QMessageBox.information(self, "Still Extracting",
+                                    "The PDF text is still being extracted. Please try again in a moment.")
+            return
+        self._show_more_pdf_pages()
         if not self.pdf_viewer.toPlainText():
             QMessageBox.information(self, "No Content", "No PDF content to save.")
             return
@@ -1362,32 +2131,22 @@ class HeartMatchEnhancedGUI(QMainWindow):
         ])
         child_layout.addRow("Location Region:", self.child_location)
         
+        self.child_age.valueChanged.connect(self.mark_dirty)
+        self.child_interests.textChanged.connect(self.mark_dirty)
+        self.child_special_needs.textChanged.connect(self.mark_dirty)
+        self.child_personality.currentIndexChanged.connect(self.mark_dirty)
+        self.child_location.currentIndexChanged.connect(self.mark_dirty)
+        
         layout.addWidget(child_group)
         
         # Matching Controls
         controls_group = QGroupBox("🔍 Matching Controls")
         controls_layout = QVBoxLayout(controls_group)
         
-        self.find_matches_button = QPushButton("💕 Find Loving Families")
-        self.find_matches_button.setStyleSheet("""
-            QPushButton {
-                background: linear-gradient(135deg, #FF69B4, #FF1493);
-                color: white;
-                font-size: 16px;
-                font-weight: bold;
-                padding: 15px;
-                border-radius: 10px;
-                border: none;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #FF1493, #DC143C);
-            }
-        """)
-        self.find_matches_button.clicked.connect(self.find_matches)
+        self.find_matches_button = self._make_button("💕 Find Loving Families", self.find_matches, "findMatchesButton")
         controls_layout.addWidget(self.find_matches_button)
         
-        self.clear_profile_button = QPushButton("🔄 Clear Profile")
-        self.clear_profile_button.clicked.connect(self.clear_child_profile)
+        self.clear_profile_button = self._make_button("🔄 Clear Profile", self.clear_child_profile)
         controls_layout.addWidget(self.clear_profile_button)
         
         layout.addWidget(controls_group)
@@ -1396,25 +2155,11 @@ class HeartMatchEnhancedGUI(QMainWindow):
         results_group = QGroupBox("💖 Matching Results")
         results_layout = QVBoxLayout(results_group)
         
-        self.matching_results_list = QListWidget()
-        self.matching_results_list.setStyleSheet("""
-            QListWidget {
-                background: #F8F9FA;
-                border: 2px solid #E9ECEF;
-                border-radius: 8px;
-                padding: 5px;
-            }
-            QListWidget::item {
-                padding: 10px;
-                border-bottom: 1px solid #DEE2E6;
-                border-radius: 5px;
-                margin: 2px;
-            }
-            QListWidget::item:selected {
-                background: #FFE5E5;
-                border: 2px solid #FF69B4;
-            }
-        """)
+        # Rows are (rank, match) pairs for matches whose family is known
+        self.matching_results_model = RecordListModel(self._match_label, self)
+        self.matching_results_list = QListView()
+        self.matching_results_list.setModel(self.matching_results_model)
+        self.matching_results_list.setObjectName("matchingResultsList")
         results_layout.addWidget(self.matching_results_list)
         
         layout.addWidget(results_group)
@@ -1431,40 +2176,24 @@ class HeartMatchEnhancedGUI(QMainWindow):
         family_layout = QVBoxLayout(family_group)
         
         # Family list
-        self.family_list = QListWidget()
-        self.family_list.setStyleSheet("""
-            QListWidget {
-                background: #F0F8FF;
-                border: 2px solid #B0C4DE;
-                border-radius: 8px;
-                padding: 5px;
-            }
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #D3D3D3;
-                border-radius: 5px;
-                margin: 2px;
-            }
-            QListWidget::item:selected {
-                background: #E6F3FF;
-                border: 2px solid #4169E1;
-            }
-        """)
+        self.family_model = RecordListModel(
+            lambda family: f"{family['family_type']} - {family['age_range']} - {family['location']}", self
+        )
+        self.family_list = QListView()
+        self.family_list.setModel(self.family_model)
+        self.family_list.setObjectName("familyList")
         family_layout.addWidget(self.family_list)
         
         # Family management buttons
         family_buttons = QHBoxLayout()
         
-        self.add_family_button = QPushButton("➕ Add Family")
-        self.add_family_button.clicked.connect(self.add_family)
+        self.add_family_button = self._make_button("➕ Add Family", self.add_family)
         family_buttons.addWidget(self.add_family_button)
         
-        self.edit_family_button = QPushButton("✏️ Edit Family")
-        self.edit_family_button.clicked.connect(self.edit_family)
+        self.edit_family_button = self._make_button("✏️ Edit Family", self.edit_family)
         family_buttons.addWidget(self.edit_family_button)
         
-        self.view_family_button = QPushButton("👁️ View Details")
-        self.view_family_button.clicked.connect(self.view_family_details)
+        self.view_family_button = self._make_button("👁️ View Details", self.view_family_details)
         family_buttons.addWidget(self.view_family_button)
         
         family_layout.addLayout(family_buttons)
@@ -1477,26 +2206,16 @@ class HeartMatchEnhancedGUI(QMainWindow):
         
         self.ai_analysis_text = QTextBrowser()
         self.ai_analysis_text.setMaximumHeight(200)
-        self.ai_analysis_text.setStyleSheet("""
-            QTextBrowser {
-                background: #FFF8DC;
-                border: 2px solid #DAA520;
-                border-radius: 8px;
-                padding: 10px;
-                font-family: 'Segoe UI', sans-serif;
-            }
-        """)
+        self.ai_analysis_text.setObjectName("aiAnalysisText")
         ai_layout.addWidget(self.ai_analysis_text)
         
         # AI controls
         ai_controls = QHBoxLayout()
         
-        self.analyze_compatibility_button = QPushButton("🧠 Analyze Compatibility")
-        self.analyze_compatibility_button.clicked.connect(self.analyze_compatibility)
+        self.analyze_compatibility_button = self._make_button("🧠 Analyze Compatibility", self.analyze_compatibility)
         ai_controls.addWidget(self.analyze_compatibility_button)
         
-        self.export_results_button = QPushButton("📊 Export Results")
-        self.export_results_button.clicked.connect(self.export_results)
+        self.export_results_button = self._make_button("📊 Export Results", self.export_results)
         ai_controls.addWidget(self.export_results_button)
         
         ai_layout.addLayout(ai_controls)
@@ -1549,119 +2268,148 @@ class HeartMatchEnhancedGUI(QMainWindow):
     
     def refresh_family_list(self):
         """Refresh the family list display"""
-        self.family_list.clear()
-        for family in self.family_database:
-            item_text = f"{family['family_type']} - {family['age_range']} - {family['location']}"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.UserRole, family)
-            self.family_list.addItem(item)
+        self.mark_dirty()
+        # Every change to family_database ends up here, so keep the id lookup in step
+        self.family_by_id = {family['id']: family for family in self.family_database}
+        self._family_fields.clear()
+        self._family_db_version += 1
+        self.family_model.set_records(list(self.family_database))
+    
+    def _current_child_profile(self):
+        """Child profile as currently entered in the form"""
+        return {
+            'age': self.child_age.value(),
+            'interests': self.child_interests.text(),
+            'special_needs': self.child_special_needs.toPlainText(),
+            'personality': self.child_personality.currentText(),
+            'location': self.child_location.currentText()
+        }
     
     def find_matches(self):
         """Find matching families using AI"""
         try:
             # Get child profile
-            child_profile = {
-                'age': self.child_age.value(),
-                'interests': self.child_interests.text(),
-                'special_needs': self.child_special_needs.toPlainText(),
-                'personality': self.child_personality.currentText(),
-                'location': self.child_location.currentText()
-            }
+            child_profile = self._current_child_profile()
             
             # Validate PII compliance
             if not PIIProtection.validate_pii_compliance(child_profile):
                 QMessageBox.warning(self, "PII Compliance", "Please ensure all required fields are completed.")
                 return
             
+            if self.matching_worker is not None and self.matching_worker.isRunning():
+                return
+            
+            # The same profile against unchanged families and model gives the
+            # same recommendations; reuse them instead of re-running the model
+            match_key = (ResponseCache.make_key(json.dumps(child_profile, sort_keys=True)),
+                         self._family_db_version, self.current_model)
+            cached = self._match_cache.get(match_key)
+            if cached is not None:
+                self._match_cache.move_to_end(match_key)
+                self._last_child_profile = child_profile
+                self._dirty = False
+                self.on_matches_ready(cached)
+                return
+            self._pending_match_key = match_key
+            self._last_child_profile = child_profile
+            
             # Show progress
             self.statusBar().showMessage("🤖 AI is analyzing compatibility... Please wait.")
+            self.find_matches_button.setEnabled(False)
+            # Edits made while this run is in flight mark the data dirty again
+            self._dirty = False
             
-            # Get AI recommendations
-            recommendations = self.matching_engine.get_matching_recommendations(
-                child_profile, self.family_database
+            # Get AI recommendations in the background
+            self.matching_worker = MatchingWorker(
+                self.matching_engine, child_profile, self.family_database, self
             )
-            
-            # Display results
-            self.display_matching_results(recommendations)
-            
-            self.statusBar().showMessage(f"✅ Found {len(recommendations)} potential matches!")
+            self.matching_worker.results_ready.connect(self.on_matches_ready)
+            self.matching_worker.error.connect(self.on_matching_error)
+            self.matching_worker.finished.connect(lambda: self.find_matches_button.setEnabled(True))
+            self.matching_worker.start()
             
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to find matches: {str(e)}")
-            self.statusBar().showMessage("❌ Error occurred during matching.")
+            self.on_matching_error(str(e))
+    
+    def on_matches_ready(self, recommendations):
+        """Display recommendations delivered by the matching worker"""
+        # Empty lists also come back from engine errors, so aren't kept
+        if recommendations and self._pending_match_key is not None:
+            self._match_cache[self._pending_match_key] = recommendations
+            while len(self._match_cache) > MATCH_CACHE_SIZE:
+                self._match_cache.popitem(last=False)
+        self._pending_match_key = None
+        self.display_matching_results(recommendations)
+        self.statusBar().showMessage(f"✅ Found {len(recommendations)} potential matches!")
+    
+    def on_matching_error(self, message):
+        """Report a matching failure"""
+        self._pending_match_key = None
+        QMessageBox.critical(self, "Error", f"Failed to find matches: {message}")
+        self.statusBar().showMessage("❌ Error occurred during matching.")
     
     def display_matching_results(self, recommendations):
         """Display matching results in the UI"""
-        self.matching_results_list.clear()
         self.matching_results = recommendations
         
-        for i, match in enumerate(recommendations[:10]):  # Show top 10 matches
-            family_id = match['family_id']
-            score = match['match_score']
-            
-            # Find family details
-            family = next((f for f in self.family_database if f['id'] == family_id), None)
-            if family:
-                item_text = f"💖 Match #{i+1}: {family['family_type']} - Score: {score}%"
-                item = QListWidgetItem(item_text)
-                item.setData(Qt.UserRole, match)
-                self.matching_results_list.addItem(item)
+        # Show top 10 matches whose family details are known
+        self.matching_results_model.set_records([
+            (i, match) for i, match in enumerate(top_matches(recommendations, 10))
+            if match['family_id'] in self.family_by_id
+        ])
+    
+    def _match_label(self, row):
+        """List text for a (rank, match) row of the results view"""
+        rank, match = row
+        family = self.family_by_id.get(match['family_id'], {})
+        return f"💖 Match #{rank + 1}: {family.get('family_type', 'Unknown family')} - Score: {match['match_score']}%"
     
     def analyze_compatibility(self):
         """Analyze compatibility between selected child and family"""
-        current_item = self.matching_results_list.currentItem()
-        if not current_item:
+        current = self.matching_results_model.record(self.matching_results_list.currentIndex())
+        if not current:
             QMessageBox.information(self, "Selection Required", "Please select a match to analyze.")
             return
         
-        match_data = current_item.data(Qt.UserRole)
+        match_data = current[1]
         family_id = match_data['family_id']
         
         # Find family details
-        family = next((f for f in self.family_database if f['id'] == family_id), None)
+        family = self.family_by_id.get(family_id)
         if not family:
             return
         
-        # Get child profile
-        child_profile = {
-            'age': self.child_age.value(),
-            'interests': self.child_interests.text(),
-            'special_needs': self.child_special_needs.toPlainText(),
-            'personality': self.child_personality.currentText(),
-            'location': self.child_location.currentText()
-        }
+        # Reuse the profile from the last run unless the form changed since
+        child_profile = self._last_child_profile
+        if child_profile is None or self._dirty:
+            child_profile = self._current_child_profile()
         
         # Display AI analysis
-        analysis_text = f"""
-🤖 AI Compatibility Analysis (Model: {self.current_model})
-
-Child Profile:
-• Age: {child_profile['age']} years
-• Interests: {child_profile['interests']}
-• Personality: {child_profile['personality']}
-• Special Needs: {child_profile['special_needs']}
-
-Family Profile:
-• Type: {family['family_type']}
-• Age Range: {family['age_range']}
-• Interests: {', '.join(family['interests'])}
-• Specializations: {', '.join(family['specializations'])}
-• Values: {family['values']}
-
-Match Score: {match_data['match_score']}%
-
-AI Reasoning:
-{match_data['reasoning']}
-
-Recommendations:
-• Consider scheduling a supervised meeting
-• Discuss specific needs and expectations
-• Review family's experience with similar situations
-• Plan gradual integration if match proceeds
-        """
+        analysis_text = _ANALYSIS_TEMPLATE.format_map({
+            **self._family_template_fields(family),
+            'model': self.current_model,
+            'age': child_profile['age'],
+            'child_interests': child_profile['interests'],
+            'personality': child_profile['personality'],
+            'special_needs': child_profile['special_needs'],
+            'match_score': match_data['match_score'],
+            'reasoning': match_data['reasoning'],
+        })
         
         self.ai_analysis_text.setPlainText(analysis_text)
     
+    def _family_template_fields(self, family):
+        """Family values for the text templates, with the lists pre-joined"""
+        fields = self._family_fields.get(family['id'])
+        if fields is None:
+            fields = dict(family)
+            fields['interests_list'] = ', '.join(family['interests'])
+            fields['specializations_list'] = ', '.join(family['specializations'])
+            fields['interests_bullets'] = "\n".join(f"• {interest}" for interest in family['interests'])
+            fields['specializations_bullets'] = "\n".join(f"• {spec}" for spec in family['specializations'])
+            self._family_fields[family['id']] = fields
+        return fields
+    
     def add_family(self):
         """Add a new family to the database"""
         QMessageBox.information(self, "Add Family", "Family addition feature will be implemented in the full version.")
@@ -1672,31 +2420,12 @@ Recommendations:
     
     def view_family_details(self):
         """View detailed family information"""
-        current_item = self.family_list.currentItem()
-        if not current_item:
+        family = self.family_model.record(self.family_list.currentIndex())
+        if not family:
             QMessageBox.information(self, "Selection Required", "Please select a family to view details.")
             return
-        
-        family = current_item.data(Qt.UserRole)
-        
-        details_text = f"""
-👨‍👩‍👧‍👦 Family Details
-
-Family ID: {family['id']}
-Type: {family['family_type']}
-Age Range: {family['age_range']}
-Location: {family['location']}
-
-Interests:
-{chr(10).join(f"• {interest}" for interest in family['interests'])}
 
-Specializations:
-{chr(10).join(f"• {spec}" for spec in family['specializations'])}
-
-Home Type: {family['home_type']}
-Pets: {family['pets']}
-Values: {family['values']}
-        """
+        details_text = _FAMILY_DETAILS_TEMPLATE.format_map(self._family_template_fields(family))
         
         QMessageBox.information(self, "Family Details", details_text)
     
@@ -1707,7 +2436,7 @@ Values: {family['values']}
         self.child_special_needs.clear()
         self.child_personality.setCurrentIndex(0)
         self.child_location.setCurrentIndex(0)
-        self.matching_results_list.clear()
+        self.matching_results_model.set_records([])
         self.ai_analysis_text.clear()
     
     def export_results(self):
@@ -1716,9 +2445,12 @@ Values: {family['values']}
             QMessageBox.information(self, "No Results", "No matching results to export.")
             return
         
+        # One clock reading, so the file name and timestamp agree
+        now = datetime.now()
+        
         # Create export data (anonymized)
         export_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'model_used': self.current_model,
             'matches': len(self.matching_results),
             'top_matches': [
@@ -1728,25 +2460,36 @@ Values: {family['values']}
                     'score': match['match_score'],
                     'timestamp': match['timestamp']
                 }
-                for i, match in enumerate(self.matching_results[:5])
+                for i, match in enumerate(top_matches(self.matching_results, 5))
             ]
         }
         
         # Save to file
-        filename = f"HeartMatch_Results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        filename = f"HeartMatch_Results_{now.strftime('%Y%m%d_%H%M%S')}.json"
         try:
-            with open(filename, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            _write_json_file(filename, export_data)
             QMessageBox.information(self, "Export Complete", f"Results exported to {filename}")
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to export: {str(e)}")
     
+    def mark_dirty(self, *args):
+        """Note that matching inputs changed since the last run"""
+        self._dirty = True
+    
     def refresh_matches(self):
-        """Refresh matching results"""
-        if self.matching_results:
-            self.statusBar().showMessage("🔄 Refreshing matches...")
-            # Re-run matching if needed
-            self.statusBar().showMessage("✅ Matches refreshed")
+        """Point out stale matching results; re-running them is left to the user"""
+        if self.matching_results and self._dirty:
+            self.statusBar().showMessage("🔄 Inputs changed since the last run - click Find Matches to refresh")
+    
+    def closeEvent(self, event):
+        """Release network resources on shutdown"""
+        self.refresh_timer.stop()
+        if self.matching_worker is not None:
+            self.matching_worker.wait()
+        self._close_pdf_document()
+        QThreadPool.globalInstance().waitForDone()
+        self.matching_engine.close()
+        super().closeEvent(event)
 
 def main():
     """Main application entry point"""
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+🧩 HeartMatch Matching Helpers
+© 2025 HeartMatch - Child-Family Matching System
+
+Prompt serialization, batch matching prompts and replies, family
+pre-ranking and reply caching shared by the standalone matching system and
+the enhanced GUI.
+"""
+
+import hashlib
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+# Generation budget per family when all families are scored in one prompt
+BATCH_TOKENS_PER_FAMILY = 400
+
+BATCH_MATCH_PROMPT = """
+            You are a compassionate AI helping match children with loving families.
+            Analyze the child profile against each of the family profiles below:
+            
+            Child Profile: {child_profile}
+            Family Profiles: {family_profiles}
+            
+            Consider:
+            - Compatibility factors (interests, values, lifestyle)
+            - Special needs accommodations
+            - Age appropriateness
+            - Geographic considerations
+            - Family dynamics and preferences
+            
+            Return only a JSON array with one entry per family, in the form:
+            [{{"family_id": "<id>", "score": <0-100>, "reasoning": "<short explanation>"}}]
+            Be empathetic and focus on the child's best interests.
+            """
+
+def prompt_json(data):
+    """Serialize data for a prompt without whitespace the model doesn't need"""
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(json.dumps(data, indent=2))
+    return json.dumps(data, separators=(',', ':'))
+
+def batch_match_prompt(child_json, families_anon):
+    """Prompt asking the model to score every family in one reply"""
+    return BATCH_MATCH_PROMPT.format(child_profile=child_json, family_profiles=prompt_json(families_anon))
+
+def parse_batch_reply(response, families_anon):
+    """Recommendations from a batch reply, skipping unusable entries
+    
+    Entries for unknown or already-scored families and entries without an
+    integer score are dropped; the caller scores the missing families itself.
+    """
+    try:
+        entries = json.loads(response[response.index('['):response.rindex(']') + 1])
+    except ValueError:
+        logging.warning("Batch matching reply was not a JSON array; scoring families individually")
+        return []
+    
+    known_ids = {family.get('id', 'unknown') for family in families_anon}
+    timestamp = datetime.now().isoformat()
+    recommendations = []
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or entry.get('family_id') not in known_ids:
+            continue
+        try:
+            score = int(entry['score'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        known_ids.discard(entry['family_id'])
+        recommendations.append({
+            'family_id': entry['family_id'],
+            'match_score': score,
+            'reasoning': str(entry.get('reasoning', '')),
+            'timestamp': timestamp
+        })
+    return recommendations
+
+def interest_tokens(interests):
+    """Normalize a comma-separated string or list of interests to a set"""
+    if isinstance(interests, str):
+        interests = interests.split(',')
+    return {interest.strip().lower() for interest in interests or () if interest.strip()}
+
+class FamilyFeatureIndex:
+    """Column-oriented matching features for a family database
+    
+    Interests are interned into a shared vocabulary and stored as one integer
+    bitmask per family, so interest overlap is a single AND + bit count.
+    Locations are interned to integer codes the same way.
+    """
+    
+    def __init__(self, family_profiles):
+        self.families = list(family_profiles)
+        self.vocabulary = {}
+        self.location_codes = {}
+        self.locations = [self.location_codes.setdefault(family.get('location'), len(self.location_codes))
+                          for family in self.families]
+        self.interest_masks = [self.interest_mask(family.get('interests')) for family in self.families]
+    
+    def interest_mask(self, interests, grow=True):
+        """Encode interests as a bitmask over the vocabulary"""
+        mask = 0
+        for token in interest_tokens(interests):
+            bit = self.vocabulary.get(token)
+            if bit is None:
+                if not grow:
+                    continue  # Interests no family has cannot add overlap
+                bit = self.vocabulary[token] = len(self.vocabulary)
+            mask |= 1 << bit
+        return mask
+    
+    def prescores(self, child_profile):
+        """Cheap rule-based compatibility estimate for every family, in index order"""
+        child_mask = self.interest_mask(child_profile.get('interests'), grow=False)
+        # -1 matches no family when the child's location is not in the index
+        child_location = self.location_codes.get(child_profile.get('location'), -1)
+        return [
+            bin(child_mask & mask).count('1') + (2 if location == child_location else 0)
+            for mask, location in zip(self.interest_masks, self.locations)
+        ]
+    
+    def top(self, child_profile, count):
+        """Return the families with the highest pre-rank scores"""
+        scores = self.prescores(child_profile)
+        best = heapq.nlargest(count, range(len(scores)), key=scores.__getitem__)
+        return [self.families[i] for i in best]
+
+class ResponseCache:
+    """Thread-safe, in-memory LRU cache of model replies with a time-to-live"""
+    
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(*parts):
+        """Hash the request parts into a cache key"""
+        return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()
+    
+    def get(self, key):
+        """Return the cached reply, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        """Store a reply, evicting the least recently used past the limit"""
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every cached reply"""
+        with self._lock:
+            self._entries.clear()
@@ -9,6 +9,25 @@ Setup script for configuring API keys for Sundai.club deployment.
 import os
 import json
 import sys
+from pathlib import Path
+
+# Optional faster JSON; the standard library is used otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _read_json(path):
+    """Load a JSON file"""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _write_json(path, data):
+    """Write data to a file as indented JSON"""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        Path(path).write_text(json.dumps(data, indent=2))
 
 def setup_config():
     """Setup configuration for HeartMatch deployment"""
@@ -29,14 +48,12 @@ def setup_config():
     
     # Copy template to config.json
     try:
-        with open('config_template.json', 'r') as f:
-            template = json.load(f)
+        template = _read_json('config_template.json')
         
         # Update with placeholder API key
         template['ollama_cloud']['api_key'] = 'YOUR_OLLAMA_CLOUD_API_KEY_HERE'
         
-        with open('config.json', 'w') as f:
-            json.dump(template, f, indent=2)
+        _write_json('config.json', template)
         
         print("✅ config.json created successfully")
         print("🔑 Please update the API key in config.json")
@@ -54,8 +71,7 @@ def check_config():
         return False
     
     try:
-        with open('config.json', 'r') as f:
-            config = json.load(f)
+        config = _read_json('config.json')
         
         api_key = config.get('ollama_cloud', {}).get('api_key', '')
         
@@ -8,6 +8,14 @@ Test script to verify that the admin credentials work properly.
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+def _create_session(pool_size):
+    """Keep-alive session whose pool covers every concurrent probe"""
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+    return session
 
 def test_web_app_auth():
     """Test web app authentication"""
@@ -21,11 +29,28 @@ def test_web_app_auth():
         {"name": "Enhanced App", "url": "http://localhost:5000", "file": "mistral_heartmatch.py"}
     ]
     
-    for app in web_apps:
+    chatbot_data = {
+        "message": "Hello, I'm testing the chatbot functionality.",
+        "user_type": "general"
+    }
+    
+    # Every probe is independent, so send them all at once; each section
+    # below then reports its own result in order
+    probe_count = len(web_apps) + 2
+    session = _create_session(probe_count)
+    executor = ThreadPoolExecutor(max_workers=probe_count)
+    health_checks = [executor.submit(session.get, f"{app['url']}/api/health", timeout=5)
+                     for app in web_apps]
+    chatbot_check = executor.submit(session.post, "http://localhost:5000/api/chatbot",
+                                    json=chatbot_data, timeout=30)
+    models_check = executor.submit(session.get, "http://localhost:5000/api/models", timeout=5)
+    executor.shutdown(wait=False)
+    
+    for app, health_check in zip(web_apps, health_checks):
         print(f"\n📱 Testing {app['name']}...")
         try:
             # Test health endpoint
-            response = requests.get(f"{app['url']}/api/health", timeout=5)
+            response = health_check.result()
             if response.status_code == 200:
                 data = response.json()
                 print(f"✅ {app['name']} is running")
@@ -49,14 +74,7 @@ def test_web_app_auth():
     
     # Test chatbot endpoint
     try:
-        chatbot_data = {
-            "message": "Hello, I'm testing the chatbot functionality.",
-            "user_type": "general"
-        }
-        
-        response = requests.post("http://localhost:5000/api/chatbot", 
-                               json=chatbot_data, 
-                               timeout=30)
+        response = chatbot_check.result()
         
         if response.status_code == 200:
             data = response.json()
@@ -74,7 +92,7 @@ def test_web_app_auth():
     # Test model selection
     try:
         # Get available models
-        response = requests.get("http://localhost:5000/api/models", timeout=5)
+        response = models_check.result()
         if response.status_code == 200:
             data = response.json()
             print("✅ Model selection working")
@@ -85,6 +103,8 @@ def test_web_app_auth():
             
     except Exception as e:
         print(f"❌ Model selection test failed: {str(e)}")
+    
+    session.close()
 
 def test_gui_components():
     """Test GUI components"""
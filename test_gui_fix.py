@@ -8,9 +8,26 @@ Quick test to verify GUI launches without accessibility features.
 
 import sys
 import os
+import importlib.util
 
-# Add current directory to path
-sys.path.append(os.path.dirname(__file__))
+# Add current directory to the front of the path so sibling modules resolve first
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+def load_gui_module():
+    """Load HeartMatch_Enhanced_GUI from its file, reusing an already imported copy"""
+    module = sys.modules.get("HeartMatch_Enhanced_GUI")
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            "HeartMatch_Enhanced_GUI", os.path.join(BASE_DIR, "HeartMatch_Enhanced_GUI.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["HeartMatch_Enhanced_GUI"] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules["HeartMatch_Enhanced_GUI"]
+            raise
+    return module
 
 try:
     from PyQt5.QtWidgets import QApplication
@@ -18,13 +35,14 @@ try:
     
     print("✅ PyQt5 imports successful")
     
-    # Test basic GUI creation
-    app = QApplication(sys.argv)
+    # Test basic GUI creation (Qt allows one QApplication per process, so
+    # reuse it when this check runs alongside other GUI code)
+    app = QApplication.instance() or QApplication(sys.argv)
     print("✅ QApplication created successfully")
     
     # Test if we can import the main GUI class
     try:
-        from HeartMatch_Enhanced_GUI import HeartMatchEnhancedGUI
+        HeartMatchEnhancedGUI = load_gui_module().HeartMatchEnhancedGUI
         print("✅ HeartMatchEnhancedGUI class imported successfully")
         
         # Test GUI creation
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+🧪 HeartMatch Matching Engine Parsing Test
+© 2025 HeartMatch - Child-Family Matching System
+
+Test score extraction, batch reply parsing, the response cache and the
+family feature index without a running Ollama server.
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from HeartMatch_Child_Family_Matching_System import OllamaMatchingEngine
+from matching_common import FamilyFeatureIndex, ResponseCache
+
+# (model reply, expected score)
+SCORE_CASES = (
+    ("Score: 85", 85),
+    ("Match Score: 87%", 87),
+    ("Overall: 72", 72),
+    ("<score>64</score>", 64),
+    ('{"score": 91, "reasoning": "cut', 91),
+    ("**Score:** 85", 85),
+    ("Score - 85", 85),
+    ("The score is 85", 85),
+    ("Matching score (0-100): 85", 85),
+    ("A compatibility score of 78 reflects shared interests", 78),
+    ("Score: 250 out of 1000, so overall: 25", 25),
+    ("No number here", 50),
+)
+
+# (model reply, expected (score, reasoning))
+REPLY_CASES = (
+    ('{"score": 88, "reasoning": "Shared love of music"}', (88, "Shared love of music")),
+    ('{"score": 70, "reasoning": "Both enjoy \\"hiking\\" and', (70, 'Both enjoy "hiking" and')),
+    ("Score: 60\nGood fit overall", (60, "Score: 60\nGood fit overall")),
+)
+
+FAMILIES = [
+    {'id': 'f1', 'interests': 'music, hiking', 'location': 'Boston'},
+    {'id': 'f2', 'interests': ['Art', 'music'], 'location': 'Worcester'},
+    {'id': 'f3', 'interests': '', 'location': 'Boston'},
+]
+
+def _engine_replying(reply):
+    """Matching engine whose Ollama calls all return the given reply"""
+    engine = OllamaMatchingEngine()
+    engine._generate = lambda *args, **kwargs: (reply, 'test-model')
+    return engine
+
+def test_extract_score():
+    """Scores are read from the common reply shapes"""
+    engine = OllamaMatchingEngine()
+    for reply, expected in SCORE_CASES:
+        assert engine._extract_score(reply) == expected, reply
+
+def test_parse_match_reply():
+    """Per-family replies split into score and reasoning"""
+    engine = OllamaMatchingEngine()
+    for reply, expected in REPLY_CASES:
+        assert engine._parse_match_reply(reply) == expected, reply
+
+def test_match_batch():
+    """Batch replies keep known, well-formed entries once each"""
+    reply = ('Here are the results:\n[{"family_id": "f1", "score": 90, "reasoning": "great"},'
+             ' {"family_id": "f1", "score": 10}, {"family_id": "zz", "score": 80},'
+             ' {"family_id": "f2", "score": "n/a"}, {"family_id": "f3", "score": "75"}]')
+    recommendations, model = _engine_replying(reply)._match_batch('{}', FAMILIES)
+    assert model == 'test-model'
+    assert [(rec['family_id'], rec['match_score']) for rec in recommendations] == [('f1', 90), ('f3', 75)]
+    
+    assert _engine_replying("I cannot rank these families.")._match_batch('{}', FAMILIES) == ([], None)
+    assert _engine_replying(None)._match_batch('{}', FAMILIES) == ([], None)
+
+def test_response_cache():
+    """Entries expire, and the least recently used are evicted first"""
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.set('a', (80, 'reason'))
+    cache.set('b', (70, ''))
+    assert cache.get('a') == (80, 'reason')
+    cache.set('c', (60, ''))
+    assert cache.get('b') is None and cache.get('a') is not None
+    
+    expired = ResponseCache(max_entries=1, ttl=-1)
+    expired.set('a', (80, ''))
+    assert expired.get('a') is None
+    assert ResponseCache.make_key('child', 'family', 'model') != ResponseCache.make_key('child', 'family', 'other')
+
+def test_feature_index():
+    """Pre-rank scores count shared interests plus a location bonus"""
+    index = FamilyFeatureIndex(FAMILIES)
+    child = {'interests': 'Music, hiking, chess', 'location': 'Boston'}
+    assert index.prescores(child) == [4, 1, 2]
+    assert [family['id'] for family in index.top(child, 2)] == ['f1', 'f3']
+    assert index.prescores({'interests': 'chess', 'location': 'Salem'}) == [0, 0, 0]
+
+if __name__ == "__main__":
+    print("🧪 HeartMatch Matching Engine Parsing Test")
+    print("=" * 50)
+    
+    failed = False
+    for test in (test_extract_score, test_parse_match_reply, test_match_batch,
+                 test_response_cache, test_feature_index):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("\n" + "=" * 50)
+    print("❌ Some tests failed" if failed else "🎉 All parsing tests passed!")
+    sys.exit(1 if failed else 0)
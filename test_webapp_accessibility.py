@@ -11,17 +11,80 @@ import json
 import time
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Optional faster JSON; the standard library is used otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Test configuration
 BASE_URL = "http://localhost:5000"
 TEST_TIMEOUT = 10
+STARTUP_TIMEOUT = 2
+
+# Every request goes to the same host, so share one keep-alive pool. Test
+# requests are never retried, so a flaky endpoint shows up as a failure
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=20, max_retries=0))
+
+# Only the startup probe backs off and retries while the WebApp is still
+# coming up; after the last retry its final response is reported as is
+STARTUP_RETRY = Retry(total=5, backoff_factor=0.25, status_forcelist=[502, 503, 504],
+                      allowed_methods=["GET"], raise_on_status=False)
+
+def _encode_json(data):
+    """Encode a request body as JSON bytes"""
+    return orjson.dumps(data) if orjson is not None else json.dumps(data).encode('utf-8')
+
+def _response_json(response):
+    """Decode a JSON response body"""
+    return orjson.loads(response.content) if orjson is not None else response.json()
+
+# Endpoints and request bodies are fixed, so build them once
+ROOT_URL = f"{BASE_URL}/"
+ACCESSIBILITY_URL = f"{BASE_URL}/api/accessibility"
+COMPLIANCE_VALIDATE_URL = f"{BASE_URL}/api/compliance/validate"
+COMPLIANCE_AUDIT_URL = f"{BASE_URL}/api/compliance/audit"
+HEALTH_URL = f"{BASE_URL}/api/health"
+MODELS_URL = f"{BASE_URL}/api/models"
+ACCEPT_JSON = {"Accept": "application/json"}
+JSON_HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
+
+ACCESSIBILITY_SETTINGS_PAYLOAD = _encode_json({
+    'high_contrast': True,
+    'color_blind_friendly': True,
+    'font_size': 1.5
+})
+
+COMPLIANCE_VALIDATE_PAYLOAD = _encode_json({
+    'child_name': 'Test Child',
+    'child_dob': '2010-01-01',
+    'family_name': 'Test Family',
+    'family_email': 'test@example.com',
+    'family_phone': '(555) 123-4567'
+})
+
+# Pages that should load for a signed-in user, with their report labels
+PAGES = (
+    (f"{BASE_URL}/dashboard", "Dashboard"),
+    (f"{BASE_URL}/children", "Children page"),
+    (f"{BASE_URL}/families", "Families page"),
+    (f"{BASE_URL}/matching", "Matching page"),
+    (f"{BASE_URL}/chatbot", "Chatbot page"),
+)
 
 def test_webapp_startup():
     """Test if WebApp starts successfully"""
     print("🚀 Testing WebApp startup...")
     
     try:
-        response = requests.get(f"{BASE_URL}/", timeout=TEST_TIMEOUT)
+        with requests.Session() as probe:
+            probe.mount('http://', HTTPAdapter(max_retries=STARTUP_RETRY))
+            response = probe.get(ROOT_URL, timeout=STARTUP_TIMEOUT)
         if response.status_code == 200:
             print("✅ WebApp is running successfully")
             return True
@@ -36,221 +99,203 @@ def test_webapp_startup():
         print(f"❌ Error testing WebApp: {e}")
         return False
 
-def test_accessibility_features():
+def test_accessibility_features(log=print):
     """Test accessibility features"""
-    print("\n♿ Testing accessibility features...")
+    log("\n♿ Testing accessibility features...")
     
     try:
         # Test accessibility settings endpoint
-        response = requests.get(f"{BASE_URL}/api/accessibility", timeout=TEST_TIMEOUT)
+        response = SESSION.get(ACCESSIBILITY_URL, headers=ACCEPT_JSON, timeout=TEST_TIMEOUT)
         if response.status_code == 200:
-            settings = response.json()
-            print("✅ Accessibility settings endpoint working")
-            print(f"   Screen reader detected: {settings.get('screen_reader_detected', False)}")
-            print(f"   High contrast enabled: {settings.get('high_contrast_enabled', False)}")
-            print(f"   Font size multiplier: {settings.get('font_size_multiplier', 1.0)}")
-            print(f"   Color blind friendly: {settings.get('color_blind_friendly', False)}")
-            print(f"   Compliance level: {settings.get('compliance_level', 'AA')}")
+            settings = _response_json(response)
+            log("✅ Accessibility settings endpoint working")
+            log(f"   Screen reader detected: {settings.get('screen_reader_detected', False)}")
+            log(f"   High contrast enabled: {settings.get('high_contrast_enabled', False)}")
+            log(f"   Font size multiplier: {settings.get('font_size_multiplier', 1.0)}")
+            log(f"   Color blind friendly: {settings.get('color_blind_friendly', False)}")
+            log(f"   Compliance level: {settings.get('compliance_level', 'AA')}")
         else:
-            print(f"❌ Accessibility endpoint returned status: {response.status_code}")
+            log(f"❌ Accessibility endpoint returned status: {response.status_code}")
             return False
         
         # Test updating accessibility settings
-        test_settings = {
-            'high_contrast': True,
-            'color_blind_friendly': True,
-            'font_size': 1.5
-        }
-        
-        response = requests.post(f"{BASE_URL}/api/accessibility", 
-                               json=test_settings, 
-                               timeout=TEST_TIMEOUT)
+        response = SESSION.post(ACCESSIBILITY_URL,
+                                data=ACCESSIBILITY_SETTINGS_PAYLOAD,
+                                headers=JSON_HEADERS,
+                                timeout=TEST_TIMEOUT)
         if response.status_code == 200:
-            result = response.json()
-            print("✅ Accessibility settings update working")
-            print(f"   Update result: {result.get('message', 'Success')}")
+            result = _response_json(response)
+            log("✅ Accessibility settings update working")
+            log(f"   Update result: {result.get('message', 'Success')}")
         else:
-            print(f"❌ Accessibility settings update failed: {response.status_code}")
+            log(f"❌ Accessibility settings update failed: {response.status_code}")
             return False
         
         return True
         
     except Exception as e:
-        print(f"❌ Error testing accessibility: {e}")
+        log(f"❌ Error testing accessibility: {e}")
         return False
 
-def test_compliance_features():
+def test_compliance_features(log=print):
     """Test compliance features"""
-    print("\n📋 Testing compliance features...")
+    log("\n📋 Testing compliance features...")
     
     try:
-        # Test compliance validation
-        test_data = {
-            'child_name': 'Test Child',
-            'child_dob': '2010-01-01',
-            'family_name': 'Test Family',
-            'family_email': 'test@example.com',
-            'family_phone': '(555) 123-4567'
-        }
+        # Validation and the audit log are separate endpoints, so request both at once
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            validate_check = executor.submit(SESSION.post, COMPLIANCE_VALIDATE_URL,
+                                             data=COMPLIANCE_VALIDATE_PAYLOAD,
+                                             headers=JSON_HEADERS, timeout=TEST_TIMEOUT)
+            audit_check = executor.submit(SESSION.get, COMPLIANCE_AUDIT_URL,
+                                          headers=ACCEPT_JSON, timeout=TEST_TIMEOUT)
         
-        response = requests.post(f"{BASE_URL}/api/compliance/validate", 
-                               json=test_data, 
-                               timeout=TEST_TIMEOUT)
+        # Test compliance validation
+        response = validate_check.result()
         if response.status_code == 200:
-            result = response.json()
-            print("✅ Compliance validation working")
-            print(f"   Data valid: {result.get('valid', False)}")
-            print(f"   Issues: {result.get('issues', [])}")
-            print(f"   Standards: {result.get('compliance_standards', [])}")
+            result = _response_json(response)
+            log("✅ Compliance validation working")
+            log(f"   Data valid: {result.get('valid', False)}")
+            log(f"   Issues: {result.get('issues', [])}")
+            log(f"   Standards: {result.get('compliance_standards', [])}")
         else:
-            print(f"❌ Compliance validation failed: {response.status_code}")
+            log(f"❌ Compliance validation failed: {response.status_code}")
             return False
         
         # Test compliance audit
-        response = requests.get(f"{BASE_URL}/api/compliance/audit", timeout=TEST_TIMEOUT)
+        response = audit_check.result()
         if response.status_code == 200:
-            audit = response.json()
-            print("✅ Compliance audit working")
-            print(f"   Total events: {audit.get('total_events', 0)}")
-            print(f"   Successful events: {audit.get('successful_events', 0)}")
-            print(f"   Failed events: {audit.get('failed_events', 0)}")
+            audit = _response_json(response)
+            log("✅ Compliance audit working")
+            log(f"   Total events: {audit.get('total_events', 0)}")
+            log(f"   Successful events: {audit.get('successful_events', 0)}")
+            log(f"   Failed events: {audit.get('failed_events', 0)}")
         else:
-            print(f"❌ Compliance audit failed: {response.status_code}")
+            log(f"❌ Compliance audit failed: {response.status_code}")
             return False
         
         return True
         
     except Exception as e:
-        print(f"❌ Error testing compliance: {e}")
+        log(f"❌ Error testing compliance: {e}")
         return False
 
-def test_login_functionality():
+def test_login_functionality(log=print):
     """Test login functionality"""
-    print("\n🔐 Testing login functionality...")
+    log("\n🔐 Testing login functionality...")
     
     try:
-        # Test dashboard access (should work without login for now)
-        response = requests.get(f"{BASE_URL}/dashboard", timeout=TEST_TIMEOUT)
-        if response.status_code == 200:
-            print("✅ Dashboard accessible")
-        else:
-            print(f"❌ Dashboard access failed: {response.status_code}")
-            return False
+        # The page loads are independent, so fetch them all at once and
+        # report them in order (dashboard should work without login for now)
+        with ThreadPoolExecutor(max_workers=len(PAGES)) as executor:
+            responses = list(executor.map(
+                lambda page: SESSION.get(page[0], timeout=TEST_TIMEOUT), PAGES))
         
-        # Test children page
-        response = requests.get(f"{BASE_URL}/children", timeout=TEST_TIMEOUT)
-        if response.status_code == 200:
-            print("✅ Children page accessible")
-        else:
-            print(f"❌ Children page access failed: {response.status_code}")
-            return False
-        
-        # Test families page
-        response = requests.get(f"{BASE_URL}/families", timeout=TEST_TIMEOUT)
-        if response.status_code == 200:
-            print("✅ Families page accessible")
-        else:
-            print(f"❌ Families page access failed: {response.status_code}")
-            return False
-        
-        # Test matching page
-        response = requests.get(f"{BASE_URL}/matching", timeout=TEST_TIMEOUT)
-        if response.status_code == 200:
-            print("✅ Matching page accessible")
-        else:
-            print(f"❌ Matching page access failed: {response.status_code}")
-            return False
-        
-        # Test chatbot page
-        response = requests.get(f"{BASE_URL}/chatbot", timeout=TEST_TIMEOUT)
-        if response.status_code == 200:
-            print("✅ Chatbot page accessible")
-        else:
-            print(f"❌ Chatbot page access failed: {response.status_code}")
-            return False
+        for (url, label), response in zip(PAGES, responses):
+            if response.status_code == 200:
+                log(f"✅ {label} accessible")
+            else:
+                log(f"❌ {label} access failed: {response.status_code}")
+                return False
         
         return True
         
     except Exception as e:
-        print(f"❌ Error testing login functionality: {e}")
+        log(f"❌ Error testing login functionality: {e}")
         return False
 
-def test_api_endpoints():
+def test_api_endpoints(log=print):
     """Test API endpoints"""
-    print("\n🔌 Testing API endpoints...")
+    log("\n🔌 Testing API endpoints...")
     
     try:
+        # Request both endpoints together and check them in order
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            health_check = executor.submit(SESSION.get, HEALTH_URL,
+                                           headers=ACCEPT_JSON, timeout=TEST_TIMEOUT)
+            models_check = executor.submit(SESSION.get, MODELS_URL,
+                                           headers=ACCEPT_JSON, timeout=TEST_TIMEOUT)
+        
         # Test health endpoint
-        response = requests.get(f"{BASE_URL}/api/health", timeout=TEST_TIMEOUT)
+        response = health_check.result()
         if response.status_code == 200:
-            health = response.json()
-            print("✅ Health endpoint working")
-            print(f"   Status: {health.get('status', 'unknown')}")
-            print(f"   Timestamp: {health.get('timestamp', 'unknown')}")
+            health = _response_json(response)
+            log("✅ Health endpoint working")
+            log(f"   Status: {health.get('status', 'unknown')}")
+            log(f"   Timestamp: {health.get('timestamp', 'unknown')}")
         else:
-            print(f"❌ Health endpoint failed: {response.status_code}")
+            log(f"❌ Health endpoint failed: {response.status_code}")
             return False
         
         # Test models endpoint
-        response = requests.get(f"{BASE_URL}/api/models", timeout=TEST_TIMEOUT)
+        response = models_check.result()
         if response.status_code == 200:
-            models = response.json()
-            print("✅ Models endpoint working")
-            print(f"   Available models: {list(models.get('available_models', {}).keys())}")
-            print(f"   Current model: {models.get('current_model', 'unknown')}")
+            models = _response_json(response)
+            log("✅ Models endpoint working")
+            log(f"   Available models: {list(models.get('available_models', {}).keys())}")
+            log(f"   Current model: {models.get('current_model', 'unknown')}")
         else:
-            print(f"❌ Models endpoint failed: {response.status_code}")
+            log(f"❌ Models endpoint failed: {response.status_code}")
             return False
         
         return True
         
     except Exception as e:
-        print(f"❌ Error testing API endpoints: {e}")
+        log(f"❌ Error testing API endpoints: {e}")
         return False
 
+def run_groups_concurrently(tests):
+    """Run independent test groups at once, then write each group's output in one go"""
+    outputs = [[] for _ in tests]
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [executor.submit(test, output.append) for test, output in zip(tests, outputs)]
+    for output in outputs:
+        sys.stdout.write("\n".join(output) + "\n")
+    sys.stdout.flush()
+    return [future.result() for future in futures]
+
 def main():
     """Main test function"""
-    print("🧪 HeartMatch WebApp Accessibility & Login Test")
-    print("=" * 60)
-    
-    # Test WebApp startup
-    if not test_webapp_startup():
-        print("\n❌ WebApp startup test failed. Please start the WebApp first.")
-        return False
-    
-    # Test accessibility features
-    accessibility_ok = test_accessibility_features()
-    
-    # Test compliance features
-    compliance_ok = test_compliance_features()
+    try:
+        print("🧪 HeartMatch WebApp Accessibility & Login Test")
+        print("=" * 60)
     
-    # Test login functionality
-    login_ok = test_login_functionality()
+        # Test WebApp startup
+        if not test_webapp_startup():
+            print("\n❌ WebApp startup test failed. Please start the WebApp first.")
+            return False
     
-    # Test API endpoints
-    api_ok = test_api_endpoints()
+        # The remaining groups hit independent endpoints, so overlap their requests
+        accessibility_ok, compliance_ok, login_ok, api_ok = run_groups_concurrently((
+            test_accessibility_features,
+            test_compliance_features,
+            test_login_functionality,
+            test_api_endpoints,
+        ))
     
-    # Summary
-    print("\n📊 Test Results Summary:")
-    print("=" * 40)
-    print(f"🚀 WebApp Startup: {'✅ PASS' if True else '❌ FAIL'}")
-    print(f"♿ Accessibility: {'✅ PASS' if accessibility_ok else '❌ FAIL'}")
-    print(f"📋 Compliance: {'✅ PASS' if compliance_ok else '❌ FAIL'}")
-    print(f"🔐 Login Functionality: {'✅ PASS' if login_ok else '❌ FAIL'}")
-    print(f"🔌 API Endpoints: {'✅ PASS' if api_ok else '❌ FAIL'}")
+        # Summary
+        print("\n📊 Test Results Summary:")
+        print("=" * 40)
+        print(f"🚀 WebApp Startup: {'✅ PASS' if True else '❌ FAIL'}")
+        print(f"♿ Accessibility: {'✅ PASS' if accessibility_ok else '❌ FAIL'}")
+        print(f"📋 Compliance: {'✅ PASS' if compliance_ok else '❌ FAIL'}")
+        print(f"🔐 Login Functionality: {'✅ PASS' if login_ok else '❌ FAIL'}")
+        print(f"🔌 API Endpoints: {'✅ PASS' if api_ok else '❌ FAIL'}")
     
-    all_tests_passed = accessibility_ok and compliance_ok and login_ok and api_ok
+        all_tests_passed = accessibility_ok and compliance_ok and login_ok and api_ok
     
-    if all_tests_passed:
-        print("\n🎉 All tests passed! WebApp is ready for deployment.")
-        print("✅ Accessibility features working")
-        print("✅ Compliance features working")
-        print("✅ Login functionality working")
-        print("✅ API endpoints working")
-    else:
-        print("\n⚠️  Some tests failed. Please check the issues above.")
+        if all_tests_passed:
+            print("\n🎉 All tests passed! WebApp is ready for deployment.")
+            print("✅ Accessibility features working")
+            print("✅ Compliance features working")
+            print("✅ Login functionality working")
+            print("✅ API endpoints working")
+        else:
+            print("\n⚠️  Some tests failed. Please check the issues above.")
     
-    return all_tests_passed
+        return all_tests_passed
+    finally:
+        SESSION.close()
 
 if __name__ == "__main__":
     success = main()